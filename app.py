@@ -1,16 +1,23 @@
+import time
+STARTUP_TIME = time.perf_counter()  # reference for the cold-start report
+
 import pygame
 import random
 import math
-import time
-import cv2
-import mediapipe as mp
-import numpy as np
+import multiprocessing
 import threading
-from queue import Queue
+from collections import deque
 from enum import Enum
 
-# Initialize Pygame
-pygame.init()
+from autopilot import Autopilot, neighbor_table
+from camera import Camera
+from engine import Game, DIRECTIONS, UP, DOWN, LEFT, RIGHT
+from dirty_rects import DirtyRectRenderer
+from gesture_worker import WORKER_STATS, FrameRing, GestureChannel, SharedStats, run_worker
+from particles import ParticleSystem
+from profiler import FrameProfiler, ProfilerOverlay
+from quality import QUALITY_TIERS, QualityGovernor
+from render_cache import SpriteCache, StaticLayers, TextCache
 
 # Set up the game window
 WIDTH = 900
@@ -19,6 +26,12 @@ GRID_SIZE = 30
 GRID_WIDTH = WIDTH // GRID_SIZE
 GRID_HEIGHT = HEIGHT // GRID_SIZE
 
+# Board size in cells, at least the window's.  A board larger than the window
+# scrolls: the camera follows the head and only the cells in view are drawn,
+# e.g. 500 x 500
+WORLD_WIDTH = GRID_WIDTH
+WORLD_HEIGHT = GRID_HEIGHT
+
 # Game States
 class GameState(Enum):
     START_SCREEN = 1
@@ -39,49 +52,179 @@ SHADOW_COLOR = (5, 5, 15)
 BUTTON_COLOR = (50, 50, 70)
 BUTTON_HOVER = (70, 70, 90)
 
-# Create the window
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Modern Snake Game")
+# Sprite quantization: snake and food effects are pre-rendered per step
+SEGMENT_GRADIENT_STEPS = 32
+HEAD_PULSE_PHASES = 24
+FOOD_PULSE_PHASES = 24
+FOOD_GLOW_PAD = 11  # room around the food cell for its glow (max radius 25)
+FOOD_MARKER_RADIUS = 6  # edge marker pointing at food outside a scrolling view
+FOOD_MARKER_INSET = 16
+
+# Push only changed regions with display.update(rects) instead of a full flip
+# while playing; helps where the full-frame upload dominates frame time
+DIRTY_RECTS = False
+
+# Logic ticks run on a fixed-step accumulator against a monotonic clock.
+# With INTERPOLATE the snake is drawn sliding between its last two ticks,
+# which shows the game one tick behind; off, it jumps cell to cell.  A slow
+# frame runs the ticks it missed, up to MAX_CATCH_UP_TICKS
+INTERPOLATE = True
+MAX_CATCH_UP_TICKS = 3
+
+# Menu and game over screens sleep in pygame.event.wait() and redraw at
+# IDLE_FPS, or right away on input; play always runs at the full 60 FPS
+IDLE_FPS = 15
+
+# Frame profiler: F3 toggles it with its overlay, F4 saves the recorded
+# frames to PROFILE_DUMP (.csv or .jsonl)
+PROFILE = False
+PROFILE_DUMP = 'snake_profile.csv'
+
+# Visual quality: 'auto' lets the governor pick a tier from frame times,
+# or fix one of 'high', 'medium', 'low'.  Q cycles through them in game
+QUALITY = 'auto'
+BEST_QUALITY = QUALITY_TIERS[0]
+
+# OpenCV (and MediaPipe, in the worker) load only when gestures are first
+# turned on.  With PREWARM_GESTURES they are imported on a background thread
+# once the start screen is up, so pressing G later starts faster
+PREWARM_GESTURES = False
 
-# Font setup
-title_font = pygame.font.Font(None, 72)
-game_font = pygame.font.Font(None, 48)
-score_font = pygame.font.Font(None, 32)
-small_font = pygame.font.Font(None, 24)
-medium_font = pygame.font.Font(None, 36)
+# A camera that stops delivering frames is retried after CAMERA_RETRY_DELAY
+# seconds, doubling up to CAMERA_RETRY_MAX, and given up on after
+# CAMERA_MAX_FAILURES failures in a row
+CAMERA_RETRY_DELAY = 0.005
+CAMERA_RETRY_MAX = 0.2
+CAMERA_MAX_FAILURES = 50
+
+# Autopilot (A toggles it): a bot steers the snake, and in attract mode a new
+# game starts AUTOPILOT_RESTART seconds after each game over
+AUTOPILOT = False
+AUTOPILOT_RESTART = 3.0
+
+# Rendered text surfaces, shared by every screen
+text_cache = TextCache(maxsize=256)
+
+# Keyboard controls
+KEY_DIRECTIONS = {
+    pygame.K_UP: UP,
+    pygame.K_DOWN: DOWN,
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+}
+
+# Window and fonts, created by init_display() so that importing this module
+# (e.g. in the gesture worker process) never opens a window
+screen = None
+title_font = None
+game_font = None
+score_font = None
+small_font = None
+medium_font = None
+debug_font = None
+menu_button = None
+
+def init_display():
+    """Initialize pygame, create the window and load fonts"""
+    global screen, title_font, game_font, score_font, small_font, medium_font, debug_font
+    global menu_button
+    
+    pygame.init()
+    
+    # Create the window
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Modern Snake Game")
+    
+    # Font setup
+    title_font = pygame.font.Font(None, 72)
+    game_font = pygame.font.Font(None, 48)
+    score_font = pygame.font.Font(None, 32)
+    small_font = pygame.font.Font(None, 24)
+    medium_font = pygame.font.Font(None, 36)
+    debug_font = pygame.font.SysFont('monospace', 13)
+    
+    # Start button, kept for the whole session
+    menu_button = Button(WIDTH/2 - 100, HEIGHT/2 + 80, 200, 50, "START GAME", medium_font)
+    return screen
 
 class GestureController:
-    def __init__(self):
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=1, 
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        self.mp_draw = mp.solutions.drawing_utils
-        
-        # Gesture detection variables
-        self.prev_x, self.prev_y = 0, 0
-        self.swipe_threshold = 60  # More sensitive
-        self.cooldown = 0.2        # Faster response
-        self.last_swipe_time = time.time()
-        self.gesture_queue = Queue()
+    """Captures camera frames here and runs hand inference in a worker process"""
+
+    def __init__(self, max_gesture_age=0.3, roi_tracking=True, camera_index=0,
+                 frame_size=(640, 480), fps=30, fourcc=None, preview=False, preview_fps=15):
+        # Gestures older than max_gesture_age seconds (capture to read) are dropped
+        self.max_gesture_age = max_gesture_age
+        self.channel = None
+        self.stats = None
+        # Run inference on a crop around the last hand instead of the full frame
+        self.roi_tracking = roi_tracking
+        # Debug camera window with landmarks; when off no overlay work is done at all
+        self.preview = preview
+        self.preview_fps = preview_fps
+        self.last_latency = None
+        self.latencies = deque(maxlen=120)
         
-        # Camera setup
+        # Camera setup; fourcc (e.g. 'MJPG') lets USB cameras reach full fps.
+        # camera_index may also be the path of a gesture recording to replay
+        self.camera_index = camera_index
+        self.frame_size = frame_size
+        self.fps = fps
+        self.fourcc = fourcc
         self.cap = None
         self.running = False
         self.camera_thread = None
         self.camera_initialized = False
+        self.frames_captured = 0
+        self.capture_ms = None  # retrieve and copy into the ring, last frame
+        
+        # Inference worker
+        self.ring = None
+        self.worker = None
+        self.frame_ready = None
+        self.stop_event = None
+        self.frame_seq = 0
+        
+        # Background start-up, so opening the camera never blocks rendering
+        self.prewarm_thread = None
+        self.start_lock = threading.Lock()
+        self.starting = False
+        self.start_failed = False
+        self.cancelled = False
+        self.start_requested = None
+        self.ready_after = None  # seconds from start_async() to a loaded hand model
+        
+    def prewarm(self):
+        """Import the vision libraries on a background thread ahead of time"""
+        if self.prewarm_thread is None:
+            self.prewarm_thread = threading.Thread(target=self._prewarm, daemon=True)
+            self.prewarm_thread.start()
+        
+    def _prewarm(self):
+        import cv2  # noqa: F401
+        import gesture_recording  # noqa: F401
+        if multiprocessing.get_start_method() == 'fork':
+            # A forked worker inherits the parent's modules, MediaPipe included
+            import hand_tracking  # noqa: F401
         
     def init_camera(self):
         """Initialize camera safely"""
         if not self.camera_initialized:
             try:
-                self.cap = cv2.VideoCapture(0)
+                import cv2
+                from gesture_recording import ReplayCapture, is_recording
+                
+                if isinstance(self.camera_index, str) and is_recording(self.camera_index):
+                    self.cap = ReplayCapture(self.camera_index)
+                else:
+                    self.cap = cv2.VideoCapture(self.camera_index)
                 if self.cap.isOpened():
-                    self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                    self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                    self.cap.set(cv2.CAP_PROP_FPS, 30)
+                    if self.fourcc:
+                        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+                    self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_size[0])
+                    self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_size[1])
+                    self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+                    # Keep only the newest frame in the driver so reads are never stale
+                    self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                     self.camera_initialized = True
                     return True
                 else:
@@ -91,10 +234,96 @@ class GestureController:
                 return False
         return True
         
-    def start(self):
-        """Start the gesture detection in a separate thread"""
+    def start_async(self):
+        """Begin start() on a background thread; poll status() for the outcome"""
+        with self.start_lock:
+            if self.starting:
+                return False  # still starting or cancelling a previous attempt
+            self.starting = True
+        self.start_failed = False
+        self.cancelled = False
+        self.ready_after = None
+        self.start_requested = time.monotonic()
+        threading.Thread(target=self._start_in_background, daemon=True).start()
+        return True
+        
+    def _start_in_background(self):
+        started = self.start()
+        with self.start_lock:
+            if self.cancelled:
+                self._shutdown()  # stop() was called while we were starting
+            elif not started:
+                self.start_failed = True
+            self.starting = False
+        
+    def status(self):
+        """'off', 'initializing' (camera or hand model loading), 'ready' or 'failed'"""
+        if self.start_failed:
+            return 'failed'
+        if self.starting:
+            return 'initializing'
+        stats = self.stats
+        if not self.running or stats is None:
+            return 'off'
+        if self.worker and not self.worker.is_alive():
+            return 'failed'
+        if self.camera_thread and not self.camera_thread.is_alive():
+            return 'failed'  # the camera stopped delivering frames
+        if not stats['ready']:
+            return 'initializing'
+        if self.ready_after is None and self.start_requested is not None:
+            self.ready_after = time.monotonic() - self.start_requested
+        return 'ready'
+        
+    def start(self, wait_ready=0):
+        """Start frame capture in a thread and inference in a worker process.
+
+        With ``wait_ready`` (seconds), capture only begins once the hand
+        model has loaded, and a replayed recording restarts from its first
+        frame, so no frame is offered to a worker that cannot take it yet.
+        """
+        if self.prewarm_thread:
+            # Never fork while another thread may be midway through an import
+            self.prewarm_thread.join()
         if not self.init_camera():
             return False
+        
+        # The first frame fixes the shape of the shared frame ring
+        success, frame = self.cap.read()
+        if not success:
+            print("Camera returned no frames")
+            self._release_camera()
+            return False
+        
+        try:
+            self.ring = FrameRing(frame.shape)
+            self.frame_ready = multiprocessing.Event()
+            self.stop_event = multiprocessing.Event()
+            self.channel = GestureChannel()
+            self.stats = SharedStats(WORKER_STATS)
+            self.worker = multiprocessing.Process(
+                target=run_worker,
+                args=(self.ring.name, frame.shape, self.ring.slots, self.channel.name,
+                      self.stats.name, self.frame_ready, self.stop_event, self.roi_tracking,
+                      self.preview_fps if self.preview else 0),
+                daemon=True
+            )
+            self.worker.start()
+        except Exception as e:
+            print(f"Failed to start inference worker: {e}")
+            self._shutdown()
+            return False
+        
+        if wait_ready:
+            deadline = time.monotonic() + wait_ready
+            while not self.stats['ready'] and self.worker.is_alive() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            if not self.stats['ready']:
+                print("Hand model did not load in time")
+                self._shutdown()
+                return False
+            if hasattr(self.cap, 'rewind'):
+                self.cap.rewind()
             
         self.running = True
         self.camera_thread = threading.Thread(target=self._camera_loop)
@@ -103,163 +332,103 @@ class GestureController:
         return True
         
     def stop(self):
-        """Stop the gesture detection"""
+        """Stop the gesture detection, or cancel a start that is still running"""
+        with self.start_lock:
+            self.cancelled = True
+            self.start_failed = False
+            if self.starting:
+                return  # the start thread shuts down itself when it finishes
+        self._shutdown()
+        
+    def _shutdown(self):
         self.running = False
+        if self.stop_event:
+            self.stop_event.set()
         if self.camera_thread:
             self.camera_thread.join(timeout=1.0)
+            self.camera_thread = None
+        if self.worker:
+            self.worker.join(timeout=1.0)
+            if self.worker.is_alive():
+                self.worker.terminate()
+            self.worker = None
+        if self.ring:
+            self.ring.close()
+            self.ring = None
+        if self.channel:
+            self.channel.close()
+            self.channel = None
+        if self.stats:
+            self.stats.close()
+            self.stats = None
+        self._release_camera()
+        
+    def _release_camera(self):
         if self.cap:
             self.cap.release()
-        cv2.destroyAllWindows()
+        self.cap = None
+        self.camera_initialized = False
         
-    def get_gesture(self):
-        """Get the latest gesture from the queue"""
-        if not self.gesture_queue.empty():
-            return self.gesture_queue.get()
-        return None
+    def drain_gestures(self):
+        """All gestures published since the last call, oldest first, minus stale ones"""
+        if self.channel is None:
+            return []
+        return self.channel.drain(self.max_gesture_age)
+        
+    def worker_stats(self):
+        """Inference counters published by the worker (see gesture_worker.WORKER_STATS)"""
+        if self.stats is None:
+            return {}
+        return self.stats.snapshot()
+        
+    def gesture_applied(self, event):
+        """Record the capture-to-apply latency of a gesture the game acted on"""
+        latency = time.monotonic() - event.capture_time
+        self.last_latency = latency
+        self.latencies.append(latency)
+        return latency
         
     def _camera_loop(self):
-        """Main camera processing loop"""
+        """Capture stage: decode each new frame straight into the shared ring.
+
+        grab() returns as soon as the camera delivers a frame, so the capture
+        time is taken right after it.  The worker always picks the newest
+        frame in the ring and counts any it skipped as dropped.  A failed
+        grab or retrieve backs off before trying again, so a stalled camera
+        never spins this thread, and too many in a row end capture, which
+        status() then reports as 'failed'.
+        """
+        failures = 0
         while self.running and self.cap and self.cap.isOpened():
             try:
-                success, frame = self.cap.read()
-                if not success:
+                if failures:
+                    if failures >= CAMERA_MAX_FAILURES:
+                        print("Camera stopped delivering frames")
+                        break
+                    time.sleep(min(CAMERA_RETRY_DELAY * 2 ** (failures - 1), CAMERA_RETRY_MAX))
+                if not self.cap.grab():
+                    failures += 1
                     continue
-                    
-                frame = cv2.flip(frame, 1)  # Mirror image
-                h, w, _ = frame.shape
-                
-                # Convert to RGB for MediaPipe
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                result = self.hands.process(rgb_frame)
+                capture_time = time.monotonic()
                 
-                if result.multi_hand_landmarks:
-                    for hand_landmarks in result.multi_hand_landmarks:
-                        # Index fingertip position (landmark 8)
-                        x = int(hand_landmarks.landmark[8].x * w)
-                        y = int(hand_landmarks.landmark[8].y * h)
-                        
-                        # Calculate movement
-                        dx = x - self.prev_x
-                        dy = y - self.prev_y
-                        
-                        # Detect swipe gestures
-                        current_time = time.time()
-                        if current_time - self.last_swipe_time > self.cooldown:
-                            if abs(dx) > abs(dy) and abs(dx) > self.swipe_threshold:
-                                if dx > 0:
-                                    self.gesture_queue.put('RIGHT')
-                                else:
-                                    self.gesture_queue.put('LEFT')
-                                self.last_swipe_time = current_time
-                                
-                            elif abs(dy) > self.swipe_threshold:
-                                if dy < 0:
-                                    self.gesture_queue.put('UP')
-                                else:
-                                    self.gesture_queue.put('DOWN')
-                                self.last_swipe_time = current_time
-                        
-                        self.prev_x, self.prev_y = x, y
-                        
-                        # Draw hand landmarks
-                        self.mp_draw.draw_landmarks(
-                            frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
-                        )
-                        
-                        # Draw fingertip position
-                        cv2.circle(frame, (x, y), 8, (0, 255, 0), -1)
-                
-                # Add UI elements
-                cv2.putText(frame, "Snake Game Gesture Control", (10, 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-                cv2.putText(frame, "Swipe with index finger", (10, 60),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                cv2.putText(frame, "Press ESC to close camera", (10, h-20),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                
-                # Show gesture feedback
-                if not self.gesture_queue.empty():
-                    last_gesture = list(self.gesture_queue.queue)[-1]
-                    cv2.putText(frame, f"Gesture: {last_gesture}", (10, 90),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                
-                # cv2.imshow("Snake Game - Gesture Control", frame)
+                slot = self.ring.begin_write(self.frame_seq)
+                success, frame = self.cap.retrieve(slot)
+                if not success or frame.shape != slot.shape:
+                    failures += 1
+                    continue
+                failures = 0
+                if frame is not slot:
+                    slot[...] = frame
+                self.ring.end_write(self.frame_seq, capture_time)
+                self.capture_ms = (time.monotonic() - capture_time) * 1000
                 
-                # # Check for ESC key to close camera window
-                # if cv2.waitKey(1) & 0xFF == 27:
-                #     break
+                self.frame_seq += 1
+                self.frames_captured += 1
+                self.frame_ready.set()
                     
             except Exception as e:
                 print(f"Error in camera loop: {e}")
                 break
-                
-        cv2.destroyAllWindows()
-
-class Particle:
-    def __init__(self, x, y, color, velocity, life):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity = velocity
-        self.life = life
-        self.max_life = life
-        self.size = random.randint(2, 5)
-
-    def update(self):
-        self.x += self.velocity[0]
-        self.y += self.velocity[1]
-        self.life -= 1
-        self.velocity = (self.velocity[0] * 0.98, self.velocity[1] * 0.98)
-
-    def draw(self, screen):
-        if self.life <= 0:
-            return
-        alpha = int(255 * (self.life / self.max_life))
-        color = (*self.color, alpha)
-        size = max(1, int(self.size * (self.life / self.max_life)))
-        pygame.draw.circle(screen, color[:3], (int(self.x), int(self.y)), size)
-
-class Snake:
-    def __init__(self):
-        center_x = GRID_WIDTH // 2
-        center_y = GRID_HEIGHT // 2
-        self.body = [(center_x, center_y)]
-        self.direction = [1, 0]
-        self.grow = False
-        self.last_move_time = 0
-        self.move_delay = 120  # milliseconds
-
-    def can_move(self):
-        current_time = time.time() * 1000
-        return current_time - self.last_move_time >= self.move_delay
-
-    def move(self):
-        if not self.can_move():
-            return True
-
-        head = self.body[0]
-        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
-
-        # Wrap around boundaries instead of collision
-        new_head = (new_head[0] % GRID_WIDTH, new_head[1] % GRID_HEIGHT)
-
-        # Check for self collision
-        if new_head in self.body[1:]:
-            return False
-
-        self.body.insert(0, new_head)
-        if not self.grow:
-            self.body.pop()
-        else:
-            self.grow = False
-
-        self.last_move_time = time.time() * 1000
-        return True
-
-    def set_direction(self, new_direction):
-        # Prevent immediate reversal
-        if (new_direction[0] * -1, new_direction[1] * -1) != tuple(self.direction):
-            self.direction = new_direction
 
 class Button:
     def __init__(self, x, y, width, height, text, font, color=BUTTON_COLOR, hover_color=BUTTON_HOVER):
@@ -278,159 +447,316 @@ class Button:
         draw_rounded_rect(screen, color, self.rect, 10)
         
         # Draw text
-        text_surface = self.font.render(self.text, True, TEXT_COLOR)
+        text_surface = render_text(self.font, self.text, TEXT_COLOR)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
         
     def is_clicked(self, mouse_pos, mouse_click):
         return self.rect.collidepoint(mouse_pos) and mouse_click
 
+def render_text(font, text, color, antialias=True):
+    """Render text through the shared LRU cache"""
+    return text_cache.render(font, text, color, antialias)
+
 def draw_rounded_rect(surface, color, rect, radius):
     """Draw a rounded rectangle"""
     pygame.draw.rect(surface, color, rect, border_radius=radius)
 
-def draw_grid(screen):
-    """Draw a subtle grid"""
-    for x in range(0, WIDTH, GRID_SIZE):
+def draw_grid(screen, offset=(0, 0)):
+    """Draw a subtle grid, scrolled by ``offset`` pixels"""
+    for x in range(-offset[0] % GRID_SIZE, WIDTH, GRID_SIZE):
         pygame.draw.line(screen, GRID_COLOR, (x, 0), (x, HEIGHT), 1)
-    for y in range(0, HEIGHT, GRID_SIZE):
+    for y in range(-offset[1] % GRID_SIZE, HEIGHT, GRID_SIZE):
         pygame.draw.line(screen, GRID_COLOR, (0, y), (WIDTH, y), 1)
 
-def draw_snake(screen, snake, particles):
-    """Draw the snake with modern effects"""
-    for i, pos in enumerate(snake.body):
-        x = pos[0] * GRID_SIZE
-        y = pos[1] * GRID_SIZE
-        
+def draw_background(surface):
+    """Paint the background color and grid (cached as a static layer)"""
+    surface.fill(BACKGROUND)
+    draw_grid(surface)
+
+def draw_scrolling_background(screen, camera):
+    """Paint the background under a scrolling camera; its cost depends on the window only"""
+    screen.fill(BACKGROUND)
+    draw_grid(screen, (camera.x, camera.y))
+
+def snake_segment_color(index, length, pulse=0):
+    """Color of a snake segment: pulsing head, body-to-tail gradient"""
+    if index == 0:  # Head
+        color = SNAKE_HEAD
+        return (min(255, color[0] + pulse), min(255, color[1] + pulse), min(255, color[2] + pulse))
+    # Gradient from body to tail
+    factor = index / max(1, length - 1)
+    return (
+        int(SNAKE_BODY[0] * (1 - factor) + SNAKE_TAIL[0] * factor),
+        int(SNAKE_BODY[1] * (1 - factor) + SNAKE_TAIL[1] * factor),
+        int(SNAKE_BODY[2] * (1 - factor) + SNAKE_TAIL[2] * factor)
+    )
+
+def paint_segment(surface, color, detail=True):
+    """Paint one snake segment (shadow, body, highlight) at the surface origin"""
+    if detail:
         # Create shadow effect
-        shadow_rect = pygame.Rect(x + 2, y + 2, GRID_SIZE - 4, GRID_SIZE - 4)
-        draw_rounded_rect(screen, SHADOW_COLOR, shadow_rect, 8)
-        
-        # Determine color based on position
-        if i == 0:  # Head
-            color = SNAKE_HEAD
-            # Add pulsing effect
-            pulse = int(20 * math.sin(time.time() * 5))
-            color = (min(255, color[0] + pulse), min(255, color[1] + pulse), min(255, color[2] + pulse))
+        shadow_rect = pygame.Rect(2, 2, GRID_SIZE - 4, GRID_SIZE - 4)
+        draw_rounded_rect(surface, SHADOW_COLOR, shadow_rect, 8)
+    
+    # Main body segment
+    rect = pygame.Rect(0, 0, GRID_SIZE - 2, GRID_SIZE - 2)
+    draw_rounded_rect(surface, color, rect, 10)
+    if not detail:
+        return
+    
+    # Add highlight
+    highlight_rect = pygame.Rect(4, 4, GRID_SIZE - 10, GRID_SIZE - 10)
+    highlight_color = (min(255, color[0] + 30), min(255, color[1] + 30), min(255, color[2] + 30))
+    draw_rounded_rect(surface, highlight_color, highlight_rect, 6)
+
+def head_sprite(phase, detail=True):
+    """Pre-rendered head segment for a quantized pulse phase"""
+    def paint(surface):
+        pulse = int(20 * math.sin(2 * math.pi * phase / HEAD_PULSE_PHASES))
+        paint_segment(surface, snake_segment_color(0, 1, pulse), detail)
+    return sprites.get(('head', phase, detail), (GRID_SIZE, GRID_SIZE), paint)
+
+def body_sprite(step, detail=True):
+    """Pre-rendered body segment for a quantized body-to-tail gradient step"""
+    def paint(surface):
+        paint_segment(surface, snake_segment_color(step, SEGMENT_GRADIENT_STEPS), detail)
+    return sprites.get(('body', step, detail), (GRID_SIZE, GRID_SIZE), paint)
+
+def segment_position(cell, previous, alpha):
+    """Pixel position of a segment ``alpha`` of the way from ``previous`` to ``cell``.
+
+    A segment that wrapped around the board snaps instead of sliding across it.
+    """
+    x, y = cell
+    px, py = previous
+    if abs(x - px) > 1 or abs(y - py) > 1:
+        px, py = x, y
+    return (int((px + (x - px) * alpha) * GRID_SIZE),
+            int((py + (y - py) * alpha) * GRID_SIZE))
+
+def snake_positions(snake, alpha):
+    """Pixel positions of the segments, ``alpha`` of the way from the previous tick.
+
+    Every segment moves one cell per tick onto the cell of the segment ahead
+    of it, so segment i came from where segment i + 1 is now and the last
+    one from the cell the tail just left.
+    """
+    body = snake.body
+    if alpha >= 1:
+        return [(x * GRID_SIZE, y * GRID_SIZE) for x, y in body]
+    previous = list(body)[1:]
+    previous.append(snake.last_tail or body[-1])
+    return [segment_position(cell, before, alpha) for cell, before in zip(body, previous)]
+
+def visible_segments(snake, alpha, camera):
+    """(index, screen position) of the segments in the camera's view, head first.
+
+    Short snakes are walked segment by segment.  Once the snake is longer
+    than the view has cells, the view is scanned instead: each occupied
+    cell tells its segment index through ``snake.segment_at()``, and the
+    cell it slid from is the neighbor holding the next segment back.  The
+    cost is bounded by whichever is smaller, the snake or the window.
+    """
+    columns, rows = camera.visible_cells()
+    if len(snake.body) <= len(columns) * len(rows):
+        candidates = enumerate(snake_positions(snake, alpha))
+    else:
+        candidates = []
+        width, height = snake.grid_width, snake.grid_height
+        last = len(snake.body) - 1
+        for y in rows:
+            for x in columns:
+                index = snake.segment_at(y * width + x)
+                if index is None:
+                    continue
+                previous = (x, y)
+                if alpha < 1:
+                    if index == last:
+                        previous = snake.last_tail or previous
+                    else:
+                        for dx, dy in DIRECTIONS.values():
+                            nx, ny = (x + dx) % width, (y + dy) % height
+                            if snake.segment_at(ny * width + nx) == index + 1:
+                                previous = (nx, ny)
+                                break
+                candidates.append((index, segment_position((x, y), previous, alpha)))
+        candidates.sort()
+    segments = []
+    for index, (x, y) in candidates:
+        x, y = camera.to_screen(x, y)
+        if camera.cell_visible(x, y):
+            segments.append((index, (x, y)))
+    return segments
+
+def draw_snake(screen, snake, particles, tier=BEST_QUALITY, alpha=1.0, camera=None):
+    """Draw the snake with modern effects, ``alpha`` of a tick past the previous one.
+
+    With a scrolling ``camera`` only the segments in its view are drawn.
+    """
+    length = len(snake.body)
+    # Pulsing head, sin(time * 5) quantized to a fixed number of phases
+    phase = int(time.time() * 5 / (2 * math.pi) * HEAD_PULSE_PHASES) % HEAD_PULSE_PHASES
+    
+    if camera is not None and camera.scrolling:
+        segments = visible_segments(snake, alpha, camera)
+    else:
+        segments = enumerate(snake_positions(snake, alpha))
+    
+    blits = []
+    head_pos = None
+    detail = tier.segment_detail
+    scale = (SEGMENT_GRADIENT_STEPS - 1) / max(1, length - 1)
+    for i, pos in segments:
+        if i == 0:
+            sprite = head_sprite(phase, detail)
+            head_pos = pos
         else:
-            # Gradient from body to tail
-            factor = i / max(1, len(snake.body) - 1)
-            color = (
-                int(SNAKE_BODY[0] * (1 - factor) + SNAKE_TAIL[0] * factor),
-                int(SNAKE_BODY[1] * (1 - factor) + SNAKE_TAIL[1] * factor),
-                int(SNAKE_BODY[2] * (1 - factor) + SNAKE_TAIL[2] * factor)
-            )
-        
-        # Main body segment
-        rect = pygame.Rect(x, y, GRID_SIZE - 2, GRID_SIZE - 2)
-        draw_rounded_rect(screen, color, rect, 10)
-        
-        # Add highlight
-        highlight_rect = pygame.Rect(x + 4, y + 4, GRID_SIZE - 10, GRID_SIZE - 10)
-        highlight_color = (min(255, color[0] + 30), min(255, color[1] + 30), min(255, color[2] + 30))
-        draw_rounded_rect(screen, highlight_color, highlight_rect, 6)
-        
-        # Add particles for the head
-        if i == 0 and random.random() < 0.2:
-            particles.append(Particle(
-                x + GRID_SIZE // 2 + random.randint(-5, 5),
-                y + GRID_SIZE // 2 + random.randint(-5, 5),
-                SNAKE_HEAD,
-                (random.uniform(-1, 1), random.uniform(-1, 1)),
-                30
-            ))
-
-def draw_food(screen, food_pos, particles):
-    """Draw the food with glow effect"""
-    x = food_pos[0] * GRID_SIZE
-    y = food_pos[1] * GRID_SIZE
+            sprite = body_sprite(max(1, round(i * scale)), detail)
+        blits.append((sprite, pos))
+    rects = screen.blits(blits)
+    
+    # Add particles for the head
+    if head_pos and random.random() < 0.2 * tier.particles:
+        x, y = head_pos
+        particles.emit(x + GRID_SIZE // 2, y + GRID_SIZE // 2, [SNAKE_HEAD],
+                       speed=1, life=30, jitter=5)
     
-    # Pulsing glow effect
-    pulse = math.sin(time.time() * 8) * 0.5 + 0.5
-    glow_size = int(15 + pulse * 10)
+    return rects
+
+def paint_food(surface, glow_size, ring_step=2):
+    """Paint the food and its glow centered in the sprite; ring_step 0 skips the glow"""
+    x = y = FOOD_GLOW_PAD
     
     # Draw glow
-    for i in range(glow_size, 0, -2):
-        alpha = int(30 * (1 - i / glow_size))
-        glow_color = FOOD_GLOW
-        pygame.draw.circle(screen, glow_color, (x + GRID_SIZE // 2, y + GRID_SIZE // 2), i)
+    if ring_step:
+        for i in range(glow_size, 0, -ring_step):
+            pygame.draw.circle(surface, FOOD_GLOW, (x + GRID_SIZE // 2, y + GRID_SIZE // 2), i)
     
     # Draw shadow
     shadow_rect = pygame.Rect(x + 2, y + 2, GRID_SIZE - 4, GRID_SIZE - 4)
-    draw_rounded_rect(screen, SHADOW_COLOR, shadow_rect, 12)
+    draw_rounded_rect(surface, SHADOW_COLOR, shadow_rect, 12)
     
     # Draw main food
     food_rect = pygame.Rect(x + 3, y + 3, GRID_SIZE - 6, GRID_SIZE - 6)
-    draw_rounded_rect(screen, FOOD_COLOR, food_rect, 12)
+    draw_rounded_rect(surface, FOOD_COLOR, food_rect, 12)
     
     # Add highlight
     highlight_rect = pygame.Rect(x + 6, y + 6, GRID_SIZE - 12, GRID_SIZE - 12)
     highlight_color = (min(255, FOOD_COLOR[0] + 50), min(255, FOOD_COLOR[1] + 50), min(255, FOOD_COLOR[2] + 50))
-    draw_rounded_rect(screen, highlight_color, highlight_rect, 8)
+    draw_rounded_rect(surface, highlight_color, highlight_rect, 8)
+
+def food_sprite(phase, ring_step=2):
+    """Pre-rendered food and glow for a quantized pulse phase"""
+    def paint(surface):
+        pulse = math.sin(2 * math.pi * phase / FOOD_PULSE_PHASES) * 0.5 + 0.5
+        paint_food(surface, int(15 + pulse * 10), ring_step)
+    size = GRID_SIZE + 2 * FOOD_GLOW_PAD
+    return sprites.get(('food', phase, ring_step), (size, size), paint)
+
+def draw_food(screen, food_pos, particles, tier=BEST_QUALITY, camera=None):
+    """Draw the food with glow effect, or a marker at the edge of the view if it is out of sight"""
+    x = food_pos[0] * GRID_SIZE
+    y = food_pos[1] * GRID_SIZE
+    if camera is not None and camera.scrolling:
+        x, y = camera.to_screen(x, y)
+        if not camera.cell_visible(x, y):
+            center = camera.edge_point(food_pos[0] * GRID_SIZE + GRID_SIZE // 2,
+                                       food_pos[1] * GRID_SIZE + GRID_SIZE // 2, FOOD_MARKER_INSET)
+            return pygame.draw.circle(screen, FOOD_COLOR, center, FOOD_MARKER_RADIUS)
+    
+    # Pulsing glow effect, sin(time * 8) quantized to a fixed number of phases
+    phase = int(time.time() * 8 / (2 * math.pi) * FOOD_PULSE_PHASES) % FOOD_PULSE_PHASES
+    rect = screen.blit(food_sprite(phase, tier.glow_ring_step), (x - FOOD_GLOW_PAD, y - FOOD_GLOW_PAD))
     
     # Add sparkle particles
-    if random.random() < 0.3:
-        particles.append(Particle(
-            x + GRID_SIZE // 2 + random.randint(-10, 10),
-            y + GRID_SIZE // 2 + random.randint(-10, 10),
-            FOOD_COLOR,
-            (random.uniform(-2, 2), random.uniform(-2, 2)),
-            40
-        ))
-
-def draw_ui(screen, score, high_score, gesture_enabled=False):
-    """Draw the user interface"""
+    if random.random() < 0.3 * tier.particles:
+        particles.emit(x + GRID_SIZE // 2, y + GRID_SIZE // 2, [FOOD_COLOR],
+                       speed=2, life=40, jitter=10)
+    
+    return rect
+
+def draw_ui(screen, score, high_score, gesture_status='off', autopilot=False):
+    """Draw the user interface; returns the rects touched"""
     # Score display
-    score_text = score_font.render(f'Score: {score}', True, TEXT_COLOR)
-    screen.blit(score_text, (20, 20))
+    score_text = render_text(score_font, f'Score: {score}', TEXT_COLOR)
+    rects = [screen.blit(score_text, (20, 20))]
     
     # High score display
-    high_score_text = small_font.render(f'Best: {high_score}', True, ACCENT_COLOR)
-    screen.blit(high_score_text, (20, 50))
+    high_score_text = render_text(small_font, f'Best: {high_score}', ACCENT_COLOR)
+    rects.append(screen.blit(high_score_text, (20, 50)))
     
     # Controls hint
-    if gesture_enabled:
-        controls_text = small_font.render('Hand Gestures Active', True, SNAKE_HEAD)
-        screen.blit(controls_text, (WIDTH - 180, HEIGHT - 50))
-        controls_text2 = small_font.render('Press G to toggle', True, (100, 100, 100))
-        screen.blit(controls_text2, (WIDTH - 150, HEIGHT - 30))
+    if autopilot:
+        rects.append(static_layers.blit('autopilot_hint', screen))
+    elif gesture_status == 'ready':
+        rects.append(static_layers.blit('gesture_hint', screen))
+    elif gesture_status == 'initializing':
+        rects.append(static_layers.blit('gesture_init_hint', screen))
     else:
-        controls_text = small_font.render('Arrow Keys | Press G for gestures', True, (100, 100, 100))
-        screen.blit(controls_text, (WIDTH - 250, HEIGHT - 30))
+        rects.append(static_layers.blit('keyboard_hint', screen))
+    
+    return rects
+
+def draw_gesture_hint(surface):
+    """Paint the controls hint shown while gestures are active"""
+    controls_text = render_text(small_font, 'Hand Gestures Active', SNAKE_HEAD)
+    surface.blit(controls_text, (WIDTH - 180, HEIGHT - 50))
+    controls_text2 = render_text(small_font, 'Press G to toggle', (100, 100, 100))
+    surface.blit(controls_text2, (WIDTH - 150, HEIGHT - 30))
+
+def draw_gesture_init_hint(surface):
+    """Paint the hint shown while the camera and hand model start up"""
+    controls_text = render_text(small_font, 'Initializing camera...', FOOD_GLOW)
+    surface.blit(controls_text, (WIDTH - 180, HEIGHT - 50))
+    controls_text2 = render_text(small_font, 'Press G to cancel', (100, 100, 100))
+    surface.blit(controls_text2, (WIDTH - 150, HEIGHT - 30))
+
+def draw_autopilot_hint(surface):
+    """Paint the controls hint shown while the autopilot plays"""
+    controls_text = render_text(small_font, 'Autopilot', ACCENT_COLOR)
+    surface.blit(controls_text, (WIDTH - 180, HEIGHT - 50))
+    controls_text2 = render_text(small_font, 'Press A to take over', (100, 100, 100))
+    surface.blit(controls_text2, (WIDTH - 180, HEIGHT - 30))
 
-def draw_start_screen(screen, particles):
+def draw_keyboard_hint(surface):
+    """Paint the controls hint shown for keyboard play"""
+    controls_text = render_text(small_font, 'Arrow Keys | Press G for gestures', (100, 100, 100))
+    surface.blit(controls_text, (WIDTH - 250, HEIGHT - 30))
+
+def draw_start_screen(screen, particles, tier=BEST_QUALITY):
     """Draw the start screen"""
     screen.fill(BACKGROUND)
     
     # Update and draw particles
-    for particle in particles:
-        particle.update()
-        particle.draw(screen)
+    particles.update()
+    particles.draw(screen)
     
     # Add some floating particles
-    if random.random() < 0.1:
-        particles.append(Particle(
-            random.randint(0, WIDTH),
-            random.randint(0, HEIGHT),
-            random.choice([SNAKE_HEAD, FOOD_COLOR, ACCENT_COLOR]),
-            (random.uniform(-1, 1), random.uniform(-1, 1)),
-            100
-        ))
+    if random.random() < 0.1 * tier.particles:
+        particles.emit(WIDTH / 2, HEIGHT / 2, [SNAKE_HEAD, FOOD_COLOR, ACCENT_COLOR],
+                       speed=1, life=100, jitter=(WIDTH / 2, HEIGHT / 2))
+    
+    static_layers.blit('start_screen', screen)
     
+    return menu_button
+
+def draw_start_screen_text(screen):
+    """Paint the unchanging start screen text (cached as a static layer)"""
     # Title with glow effect
-    title_text = title_font.render('SNAKE GAME', True, TEXT_COLOR)
+    title_text = render_text(title_font, 'SNAKE GAME', TEXT_COLOR)
     title_rect = title_text.get_rect(center=(WIDTH/2, HEIGHT/2 - 150))
     
     # Add glow effect to title
     for offset in [(3, 3), (-3, -3), (3, -3), (-3, 3)]:
-        glow_text = title_font.render('SNAKE GAME', True, ACCENT_COLOR)
+        glow_text = render_text(title_font, 'SNAKE GAME', ACCENT_COLOR)
         glow_rect = glow_text.get_rect(center=(WIDTH/2 + offset[0], HEIGHT/2 - 150 + offset[1]))
         screen.blit(glow_text, glow_rect)
     
     screen.blit(title_text, title_rect)
     
     # Subtitle
-    subtitle_text = medium_font.render('Modern Snake with Gesture Control', True, (150, 150, 150))
+    subtitle_text = render_text(medium_font, 'Modern Snake with Gesture Control', (150, 150, 150))
     subtitle_rect = subtitle_text.get_rect(center=(WIDTH/2, HEIGHT/2 - 100))
     screen.blit(subtitle_text, subtitle_rect)
     
@@ -443,109 +769,164 @@ def draw_start_screen(screen, particles):
     ]
     
     for i, feature in enumerate(features):
-        feature_text = small_font.render(feature, True, SNAKE_HEAD)
+        feature_text = render_text(small_font, feature, SNAKE_HEAD)
         feature_rect = feature_text.get_rect(center=(WIDTH/2, HEIGHT/2 - 30 + i * 25))
         screen.blit(feature_text, feature_rect)
     
-    # Start button
-    start_button = Button(WIDTH/2 - 100, HEIGHT/2 + 80, 200, 50, "START GAME", medium_font)
-    
     # Controls info
-    controls_text = small_font.render('Use Arrow Keys or Press G for Gesture Control', True, (100, 100, 100))
+    controls_text = render_text(small_font, 'Use Arrow Keys or Press G for Gesture Control', (100, 100, 100))
     controls_rect = controls_text.get_rect(center=(WIDTH/2, HEIGHT - 50))
     screen.blit(controls_text, controls_rect)
+
+def draw_game_over(screen, score, high_score, particles, won=False, tier=BEST_QUALITY):
+    """Draw game over text over the backdrop, plus explosion particles"""
+    static_layers.blit('game_over_text', screen, key=(score, high_score, won))
     
-    return start_button
+    # Add explosion particles
+    if len(particles) < 30 * tier.particles:
+        particles.emit(WIDTH // 2, HEIGHT // 2, [FOOD_COLOR, SNAKE_HEAD, ACCENT_COLOR],
+                       speed=3, life=60, count=2, jitter=100)
 
-def draw_game_over(screen, score, high_score, particles):
-    """Draw game over screen with effects"""
+def draw_game_over_backdrop(surface):
+    """Paint the background dimmed by the game over overlay (cached as a static layer)"""
+    draw_background(surface)
+    
     # Semi-transparent overlay
     overlay = pygame.Surface((WIDTH, HEIGHT))
     overlay.set_alpha(180)
     overlay.fill(BACKGROUND)
-    screen.blit(overlay, (0, 0))
+    surface.blit(overlay, (0, 0))
+
+def draw_game_over_text(screen, score, high_score, won):
+    """Paint the game over title and scores (cached per result as a static layer)"""
+    title = 'YOU WIN' if won else 'GAME OVER'
     
     # Game Over text with glow
-    game_over_text = title_font.render('GAME OVER', True, TEXT_COLOR)
+    game_over_text = render_text(title_font, title, TEXT_COLOR)
     game_over_rect = game_over_text.get_rect(center=(WIDTH/2, HEIGHT/2 - 80))
     
     # Add glow effect to text
     for offset in [(2, 2), (-2, -2), (2, -2), (-2, 2)]:
-        glow_text = title_font.render('GAME OVER', True, ACCENT_COLOR)
+        glow_text = render_text(title_font, title, ACCENT_COLOR)
         glow_rect = glow_text.get_rect(center=(WIDTH/2 + offset[0], HEIGHT/2 - 80 + offset[1]))
         screen.blit(glow_text, glow_rect)
     
     screen.blit(game_over_text, game_over_rect)
     
     # Score display
-    score_text = game_font.render(f'Final Score: {score}', True, TEXT_COLOR)
+    score_text = render_text(game_font, f'Final Score: {score}', TEXT_COLOR)
     score_rect = score_text.get_rect(center=(WIDTH/2, HEIGHT/2 - 20))
     screen.blit(score_text, score_rect)
     
     # High score
     if score >= high_score:
-        new_best_text = score_font.render('NEW BEST!', True, FOOD_COLOR)
+        new_best_text = render_text(score_font, 'NEW BEST!', FOOD_COLOR)
         new_best_rect = new_best_text.get_rect(center=(WIDTH/2, HEIGHT/2 + 20))
         screen.blit(new_best_text, new_best_rect)
     else:
-        high_score_text = score_font.render(f'Best: {high_score}', True, ACCENT_COLOR)
+        high_score_text = render_text(score_font, f'Best: {high_score}', ACCENT_COLOR)
         high_score_rect = high_score_text.get_rect(center=(WIDTH/2, HEIGHT/2 + 20))
         screen.blit(high_score_text, high_score_rect)
     
     # Restart instruction
-    restart_text = small_font.render('Press SPACE to play again or ESC to return to menu', True, (150, 150, 150))
+    restart_text = render_text(small_font, 'Press SPACE to play again or ESC to return to menu', (150, 150, 150))
     restart_rect = restart_text.get_rect(center=(WIDTH/2, HEIGHT/2 + 80))
     screen.blit(restart_text, restart_rect)
-    
-    # Add explosion particles
-    if len(particles) < 30:
-        for _ in range(2):
-            particles.append(Particle(
-                WIDTH // 2 + random.randint(-100, 100),
-                HEIGHT // 2 + random.randint(-100, 100),
-                random.choice([FOOD_COLOR, SNAKE_HEAD, ACCENT_COLOR]),
-                (random.uniform(-3, 3), random.uniform(-3, 3)),
-                60
-            ))
-
-def create_food_particles(x, y, particles):
+
+def create_food_particles(x, y, particles, tier=BEST_QUALITY):
     """Create particles when food is eaten"""
-    for _ in range(15):
-        particles.append(Particle(
-            x + random.randint(-15, 15),
-            y + random.randint(-15, 15),
-            random.choice([FOOD_COLOR, FOOD_GLOW, SNAKE_HEAD]),
-            (random.uniform(-4, 4), random.uniform(-4, 4)),
-            40
-        ))
-
-def main():
+    particles.emit(x, y, [FOOD_COLOR, FOOD_GLOW, SNAKE_HEAD],
+                   speed=4, life=40, count=round(15 * tier.particles), jitter=15)
+
+# Pre-rendered layers that only change on resize or theme change
+static_layers = StaticLayers()
+sprites = SpriteCache()
+static_layers.register('background', draw_background)
+static_layers.register('start_screen', draw_start_screen_text, transparent=True)
+static_layers.register('game_over_backdrop', draw_game_over_backdrop)
+static_layers.register('game_over_text', draw_game_over_text, transparent=True)
+static_layers.register('gesture_hint', draw_gesture_hint, transparent=True)
+static_layers.register('gesture_init_hint', draw_gesture_init_hint, transparent=True)
+static_layers.register('keyboard_hint', draw_keyboard_hint, transparent=True)
+static_layers.register('autopilot_hint', draw_autopilot_hint, transparent=True)
+
+def main(dirty_rects=DIRTY_RECTS, profile=PROFILE, profile_dump=PROFILE_DUMP,
+         prewarm=PREWARM_GESTURES, quality=QUALITY, interpolate=INTERPOLATE, autopilot=AUTOPILOT,
+         world_width=WORLD_WIDTH, world_height=WORLD_HEIGHT):
+    if screen is None:
+        init_display()
     clock = pygame.time.Clock()
     game_state = GameState.START_SCREEN
     
+    # View onto the board; it only moves when the board is larger than the window
+    camera = Camera(WIDTH, HEIGHT, world_width, world_height, GRID_SIZE)
+    
+    # Optional partial display updates while playing
+    dirty_renderer = DirtyRectRenderer(screen) if dirty_rects else None
+    
+    # Per-frame span timings; every call is a no-op while disabled
+    profiler = FrameProfiler(enabled=profile)
+    profiler_overlay = ProfilerOverlay(profiler, debug_font)
+    
+    # Effects tier, stepped down and up automatically to hold 60 FPS
+    if quality == 'auto':
+        governor = QualityGovernor()
+    else:
+        governor = QualityGovernor(quality, auto=False)
+    
     # Game variables
-    snake = None
-    food_pos = None
-    score = 0
+    game = None
+    tick_lag = 0.0  # ms of game time not simulated yet
+    last_update = time.monotonic()
     high_score = 0
-    particles = []
+    particles = ParticleSystem()
+    
+    # Bot player, steering instead of the keyboard and gestures while on
+    pilot = Autopilot(world_width, world_height) if autopilot else None
+    menu_since = time.monotonic()  # when the menu or game over screen came up
     
-    # Initialize gesture controller
+    # Gesture controller; nothing vision-related is loaded until G is pressed
     gesture_controller = GestureController()
     gesture_enabled = False
+    gesture_status = 'off'
+    first_frame = True
+    
+    # Idle screens: how long to block for input before the next frame
+    idle_wait = None
+    last_frame_time = time.monotonic()
     
     try:
         while True:
+            profiler.begin_frame()
+            if idle_wait is not None:
+                first_event = pygame.event.wait(idle_wait)
+                events = pygame.event.get()
+                if first_event.type != pygame.NOEVENT:
+                    events.insert(0, first_event)
+                profiler.lap('idle_wait')
+            else:
+                events = pygame.event.get()
+            
+            # Whole 60 FPS frames since the last one; more than one on idle screens
+            now = time.monotonic()
+            elapsed_frames = max(1, min(round((now - last_frame_time) * 60), 10))
+            last_frame_time = now
+            
             mouse_pos = pygame.mouse.get_pos()
             mouse_click = False
+            start_game = False
+            frame_rects = None
             
             # Handle events
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     return
                     
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     mouse_click = True
+                
+                if event.type == pygame.VIDEOEXPOSE and dirty_renderer:
+                    dirty_renderer.invalidate()
                     
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
@@ -553,129 +934,221 @@ def main():
                             game_state = GameState.START_SCREEN
                         elif game_state == GameState.PLAYING:
                             game_state = GameState.START_SCREEN
+                        menu_since = time.monotonic()
                     
                     if event.key == pygame.K_g:
-                        # Toggle gesture control
+                        # Toggle gesture control; the camera opens in the background
                         gesture_enabled = not gesture_enabled
                         if gesture_enabled:
-                            if gesture_controller.start():
-                                print("Gesture control enabled")
+                            if gesture_controller.start_async():
+                                print("Initializing gesture control...")
                             else:
-                                print("Failed to start gesture control")
+                                print("Gesture control is still shutting down")
                                 gesture_enabled = False
                         else:
                             gesture_controller.stop()
                             print("Gesture control disabled")
                     
-                    if game_state == GameState.START_SCREEN:
+                    if game_state in (GameState.START_SCREEN, GameState.GAME_OVER):
                         if event.key == pygame.K_SPACE:
-                            game_state = GameState.PLAYING
-                            snake = Snake()
-                            food_pos = None
-                            score = 0
-                            particles.clear()
+                            start_game = True
                     
-                    elif game_state == GameState.GAME_OVER:
-                        if event.key == pygame.K_SPACE:
-                            game_state = GameState.PLAYING
-                            snake = Snake()
-                            food_pos = None
-                            score = 0
-                            particles.clear()
+                    elif game_state == GameState.PLAYING and game:
+                        # Keyboard controls, buffered for the coming ticks
+                        if event.key in KEY_DIRECTIONS:
+                            game.queue_turn(KEY_DIRECTIONS[event.key])
+                    
+                    if event.key == pygame.K_a:
+                        pilot = None if pilot else Autopilot(world_width, world_height)
+                        menu_since = time.monotonic()
+                        if game:
+                            game.turns.clear()
+                        print(f"Autopilot {'enabled' if pilot else 'disabled'}")
+                    
+                    if event.key == pygame.K_q:
+                        print(f"Quality: {governor.cycle()}")
                     
-                    elif game_state == GameState.PLAYING and snake:
-                        # Keyboard controls
-                        if event.key == pygame.K_UP:
-                            snake.set_direction([0, -1])
-                        elif event.key == pygame.K_DOWN:
-                            snake.set_direction([0, 1])
-                        elif event.key == pygame.K_LEFT:
-                            snake.set_direction([-1, 0])
-                        elif event.key == pygame.K_RIGHT:
-                            snake.set_direction([1, 0])
+                    if event.key == pygame.K_F3:
+                        profiler.set_enabled(not profiler.enabled)
+                        if dirty_renderer:
+                            dirty_renderer.invalidate()
+                    
+                    if event.key == pygame.K_F4:
+                        frames = profiler.save(profile_dump)
+                        print(f"Saved {frames} profiled frames to {profile_dump}")
+            profiler.lap('events')
             
-            # Handle gesture input
-            if gesture_enabled and game_state == GameState.PLAYING and snake:
-                gesture = gesture_controller.get_gesture()
-                if gesture:
-                    if gesture == 'UP':
-                        snake.set_direction([0, -1])
-                    elif gesture == 'DOWN':
-                        snake.set_direction([0, 1])
-                    elif gesture == 'LEFT':
-                        snake.set_direction([-1, 0])
-                    elif gesture == 'RIGHT':
-                        snake.set_direction([1, 0])
+            # Follow the background start-up of gesture control
+            if gesture_enabled:
+                status = gesture_controller.status()
+                if status == 'ready' and gesture_status != 'ready':
+                    print(f"Gesture control enabled after {gesture_controller.ready_after:.1f} s")
+                elif status in ('failed', 'off'):
+                    print("Gesture control stopped" if gesture_status == 'ready'
+                          else "Failed to start gesture control")
+                    gesture_controller.stop()
+                    gesture_enabled = False
+                gesture_status = status if gesture_enabled else 'off'
+            else:
+                gesture_status = 'off'
             
-            # Update particles
-            particles = [p for p in particles if p.life > 0]
+            # Handle gesture input
+            if gesture_status == 'ready' and game_state == GameState.PLAYING and game and not pilot:
+                # Queue every swipe in order, so two quick ones both count
+                for gesture in gesture_controller.drain_gestures():
+                    if game.queue_turn(DIRECTIONS[gesture.direction]):
+                        profiler.record('gesture_latency_ms', gesture_controller.gesture_applied(gesture) * 1000)
+            if gesture_status == 'ready' and profiler.enabled:
+                stats = gesture_controller.worker_stats()
+                profiler.record('gesture_capture_ms', gesture_controller.capture_ms)
+                profiler.record('gesture_inference_ms', stats.get('inference_ms'))
+                profiler.record('gesture_queue_ms', stats.get('frame_age_ms'))
+            profiler.lap('gestures')
             
             # Game state logic
+            tier = governor.tier
+            if game_state != GameState.PLAYING:
+                # Keep particle motion at its 60 FPS speed at the idle frame rate
+                for _ in range(elapsed_frames - 1):
+                    particles.update()
+            
             if game_state == GameState.START_SCREEN:
-                start_button = draw_start_screen(screen, particles)
+                start_button = draw_start_screen(screen, particles, tier)
                 start_button.update(mouse_pos)
                 start_button.draw(screen)
+                profiler.lap('draw_start_screen')
                 
                 if start_button.is_clicked(mouse_pos, mouse_click):
-                    game_state = GameState.PLAYING
-                    snake = Snake()
-                    food_pos = None
-                    score = 0
-                    particles.clear()
+                    start_game = True
                     
             elif game_state == GameState.PLAYING:
-                # Generate food
-                if food_pos is None:
-                    food_pos = (random.randint(0, GRID_WIDTH-1), random.randint(0, GRID_HEIGHT-1))
-                    while food_pos in snake.body:
-                        food_pos = (random.randint(0, GRID_WIDTH-1), random.randint(0, GRID_HEIGHT-1))
-
-                # Move snake
-                if not snake.move():
-                    game_state = GameState.GAME_OVER
-                    high_score = max(high_score, score)
+                # Run as many ticks as the elapsed time covers, zero or more
+                now = time.monotonic()
+                tick_lag += (now - last_update) * 1000
+                last_update = now
+                tick_lag = min(tick_lag, MAX_CATCH_UP_TICKS * game.move_delay)
+                while tick_lag >= game.move_delay:
+                    tick_lag -= game.move_delay
+                    eaten_pos = game.food_pos
+                    if pilot:
+                        result = game.step(pilot.decide(game))
+                        profiler.record('autopilot_ms', pilot.last_decision_ms)
+                    else:
+                        result = game.step()
+                    
+                    if not result.alive:
+                        game_state = GameState.GAME_OVER
+                        menu_since = now
+                        high_score = max(high_score, game.score)
+                        break
+                    
+                    if result.ate:
+                        food_x, food_y = camera.to_screen(eaten_pos[0] * GRID_SIZE, eaten_pos[1] * GRID_SIZE)
+                        create_food_particles(food_x + GRID_SIZE // 2, food_y + GRID_SIZE // 2, particles, tier)
+                profiler.lap('logic')
+                if game_state == GameState.GAME_OVER:
                     continue
 
-                # Check for food collision
-                if snake.body[0] == food_pos:
-                    snake.grow = True
-                    food_x = food_pos[0] * GRID_SIZE + GRID_SIZE // 2
-                    food_y = food_pos[1] * GRID_SIZE + GRID_SIZE // 2
-                    create_food_particles(food_x, food_y, particles)
-                    food_pos = None
-                    score += 10
-                    # Increase speed slightly
-                    snake.move_delay = max(70, snake.move_delay - 1)
-
                 # Draw game
-                screen.fill(BACKGROUND)
-                draw_grid(screen)
+                alpha = min(1.0, tick_lag / game.move_delay) if interpolate else 1.0
+                if camera.scrolling:
+                    # Keep the head centered; particles hold their place on the board
+                    snake = game.snake
+                    previous = snake.body[1] if len(snake) > 1 else (snake.last_tail or snake.head)
+                    x, y = segment_position(snake.head, previous, alpha)
+                    dx, dy = camera.follow(x + GRID_SIZE // 2, y + GRID_SIZE // 2)
+                    particles.shift(-dx, -dy)
+                    draw_scrolling_background(screen, camera)
+                    if dirty_renderer:
+                        dirty_renderer.invalidate()  # the whole view moves
+                elif dirty_renderer:
+                    # Only repaint the background under last frame's drawing
+                    dirty_renderer.begin(lambda rect: static_layers.blit('background', screen, rect))
+                else:
+                    static_layers.blit('background', screen)
+                profiler.lap('draw_background')
                 
                 # Update and draw particles
-                for particle in particles:
-                    particle.update()
-                    particle.draw(screen)
+                particles.update()
+                frame_rects = particles.draw(screen)
+                profiler.lap('particles')
                 
-                draw_snake(screen, snake, particles)
+                frame_rects += draw_snake(screen, game.snake, particles, tier, alpha, camera)
+                profiler.lap('draw_snake')
                 
-                if food_pos:
-                    draw_food(screen, food_pos, particles)
+                if game.food_pos:
+                    frame_rects.append(draw_food(screen, game.food_pos, particles, tier, camera))
+                profiler.lap('draw_food')
                 
-                draw_ui(screen, score, high_score, gesture_enabled)
+                frame_rects += draw_ui(screen, game.score, high_score, gesture_status, pilot is not None)
+                profiler.lap('draw_ui')
                 
             elif game_state == GameState.GAME_OVER:
-                screen.fill(BACKGROUND)
-                draw_grid(screen)
+                static_layers.blit('game_over_backdrop', screen)
+                profiler.lap('draw_background')
                 
                 # Update and draw particles
-                for particle in particles:
-                    particle.update()
-                    particle.draw(screen)
+                particles.update()
+                particles.draw(screen)
+                profiler.lap('particles')
                 
-                draw_game_over(screen, score, high_score, particles)
+                draw_game_over(screen, game.score, high_score, particles, game.won, tier)
+                profiler.lap('draw_game_over')
+            
+            # Attract mode: the autopilot starts the next game on its own
+            if pilot and game_state != GameState.PLAYING and time.monotonic() - menu_since >= AUTOPILOT_RESTART:
+                start_game = True
+            
+            if gesture_status == 'initializing' and game_state != GameState.PLAYING:
+                static_layers.blit('gesture_init_hint', screen)
+
+            if start_game:
+                game_state = GameState.PLAYING
+                game = Game(world_width, world_height)
+                head_x, head_y = game.snake.head
+                camera.follow(head_x * GRID_SIZE + GRID_SIZE // 2, head_y * GRID_SIZE + GRID_SIZE // 2)
+                tick_lag = 0.0
+                last_update = time.monotonic()
+                particles.clear()
+                governor.reset()
 
-            pygame.display.flip()
+            if profiler.enabled:
+                overlay_rect = profiler_overlay.draw(screen, WIDTH - profiler_overlay.width - 10, 10)
+                if frame_rects is not None:
+                    frame_rects.append(overlay_rect)
+                profiler.lap('overlay')
+
+            if dirty_renderer and frame_rects is not None and not start_game:
+                dirty_renderer.add(frame_rects)
+                dirty_renderer.present()
+            else:
+                if dirty_renderer:
+                    dirty_renderer.invalidate()
+                pygame.display.flip()
+            profiler.lap('present')
+            
+            if first_frame:
+                first_frame = False
+                print(f"Cold start: first frame after {(time.perf_counter() - STARTUP_TIME) * 1000:.0f} ms")
+                if prewarm:
+                    gesture_controller.prewarm()
+                if camera.scrolling and not pilot:
+                    # The autopilot's neighbor table, cached per board size, takes
+                    # ~100 ms on a large board: build it off the frame so the
+                    # first A press does not stall
+                    threading.Thread(target=neighbor_table, args=(world_width, world_height),
+                                     daemon=True).start()
+            
             clock.tick(60)  # Smooth 60 FPS
+            profiler.lap('tick_wait')
+            
+            if game_state == GameState.PLAYING:
+                idle_wait = None
+                if governor.update(clock.get_time(), clock.get_rawtime()):
+                    print(f"Quality: auto, now {governor.tier.name}")
+            else:
+                idle_wait = 1000 // IDLE_FPS
+            profiler.record('quality_tier', governor.index)
     
     finally:
         # Clean up gesture controller
@@ -684,4 +1157,4 @@ def main():
 
 if __name__ == "__main__":
     main()
-    pygame.quit()
\ No newline at end of file
+    pygame.quit()
@@ -0,0 +1,378 @@
+"""Autopilot player for attract mode, soak tests and bot experiments.
+
+Plans on the engine's own flat cell layout (cell index ``y * width + x``)
+with a neighbor table precomputed once per board size, so the search never
+does wrap-around math.  The search is time aware: a body segment is gone
+after a known number of moves, so a path may enter a cell the snake still
+covers as long as it gets there after the segment has left.  When each cell
+frees up is read from ``Snake.entered``, so a decision never walks the body.
+
+Each plan is the path to the food, but only if the snake could still reach
+its own tail after eating; it is then followed move by move without
+searching again until the food is eaten.  Without a safe plan the snake
+takes the move that keeps the tail reachable by the longest route, which
+uses up open space instead of circling, and when even that is impossible it
+heads into the largest open area.  A snake that has circled for
+``patience`` moves per board cell without eating goes for the food
+regardless, so a soak game ends instead of looping forever.
+
+Searches are A* with a wrapped Manhattan distance heuristic, and all the
+searches of one decision share a budget of ``budget`` expanded cells, so a
+decision costs the same on a 500 x 500 board as on the window-sized one.
+A decision that spends the budget before it finds a safe move keeps to the
+old plan, or takes the safe move nearest the food.
+
+Run headless soak games with::
+
+    python autopilot.py --games 20 --seed 1
+"""
+import argparse
+import heapq
+import time
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+from engine import DOWN, LEFT, RIGHT, UP, Game
+
+MOVES = (UP, DOWN, LEFT, RIGHT)
+SEARCH_BUDGET = 800  # cells all the searches of one decision may expand
+
+
+@lru_cache(maxsize=4)
+def neighbor_table(grid_width, grid_height):
+    """Flat table: ``table[cell * 4 + k]`` is the cell reached by MOVES[k], wrapping"""
+    y, x = np.divmod(np.arange(grid_width * grid_height), grid_width)
+    return np.stack([
+        (x + dx) % grid_width + ((y + dy) % grid_height) * grid_width for dx, dy in MOVES
+    ], axis=1).ravel().tolist()
+
+
+class Autopilot:
+    def __init__(self, grid_width, grid_height, history=1000, patience=2, budget=SEARCH_BUDGET):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        cells = grid_width * grid_height
+        self.neighbors = neighbor_table(grid_width, grid_height)
+        self.budget = budget
+        # Search scratch space, reused: a cell is visited when its mark is the current search's
+        self.parent = [0] * cells
+        self.mark = [0] * cells
+        self.depth = [0] * cells  # moves to reach each cell pushed on the A* frontier
+        self.search = 0
+        # Wrapped distance from column or row 0 to each column or row, for the A* estimate
+        self.wrap_x = [min(x, grid_width - x) for x in range(grid_width)]
+        self.wrap_y = [min(y, grid_height - y) for y in range(grid_height)]
+        # Cells the tail check pretends the head has entered, and when
+        self.planned = [0] * cells
+        self.planned_mark = [0] * cells
+        self.patience = patience * cells
+        self.hungry = 0  # decisions since the snake last grew
+        self.last_length = 0
+        self.plan = []  # cells still to go to the food, next one last
+        self.plan_key = None  # (food cell, snake.moves) the plan expects next
+        self.left = budget  # cells the current decision may still expand
+        self.last_decision_ms = 0.0
+        self.decision_ms = deque(maxlen=history)
+
+    def __call__(self, game):
+        return self.decide(game)
+
+    def decide(self, game):
+        """Direction for the next tick; the time it took is kept in ``decision_ms``"""
+        start = time.perf_counter()
+        direction = self._decide(game.snake, game.food_pos)
+        self.last_decision_ms = (time.perf_counter() - start) * 1000
+        self.decision_ms.append(self.last_decision_ms)
+        return direction
+
+    def decision_stats(self):
+        """p50/p99/max of the recent decision times, in milliseconds"""
+        if not self.decision_ms:
+            return {}
+        times = np.fromiter(self.decision_ms, dtype=np.float64)
+        return {
+            'p50': float(np.percentile(times, 50)),
+            'p99': float(np.percentile(times, 99)),
+            'max': float(times.max()),
+        }
+
+    def _decide(self, snake, food_pos):
+        w = self.grid_width
+        neighbors = self.neighbors
+        hx, hy = snake.head
+        head = hx + hy * w
+        length = len(snake)
+        if length != self.last_length:
+            self.last_length = length
+            self.hungry = 0
+        self.hungry += 1
+        # A cell frees up ``offset + entered[cell]`` moves from now; 1 or less is free
+        offset = length + (1 if snake.grow else 0) - snake.moves
+        entered = snake.entered
+        moves = neighbors[head * 4:head * 4 + 4]
+        # Reversing is never allowed, even onto a tail that is about to move
+        dx, dy = snake.direction
+        back = moves[MOVES.index((-dx, -dy))]
+        food = None if food_pos is None else food_pos[0] + food_pos[1] * w
+
+        # Keep following the plan; nothing it relied on changes until the food is eaten
+        plan = self.plan
+        self.plan = []
+        if plan and self.plan_key == (food, snake.moves):
+            move = self._follow(plan, food, snake, moves, back, offset, entered)
+            if move is not None:
+                return move
+
+        # Every search below draws on the one budget, half of it held back
+        # for the moves that keep the tail in reach.  Once it is all spent the
+        # snake keeps to the old plan or takes the first safe move
+        reserve = self.budget // 2
+        self.left = self.budget - reserve
+        starving = self.hungry > self.patience
+        if food is not None:
+            path = self._path(head, food, offset, entered, back)
+            if path and (length < 3 or starving or self._tail_reachable(snake, path)):
+                self.plan = path[:0:-1]
+                self.plan_key = (food, snake.moves + 1)
+                return MOVES[moves.index(path[0])]
+            if starving:
+                # Head for the food regardless and let the body open a way, or end the game
+                move = self._closest_move(food_pos, snake.head, moves, back, offset, entered)
+                if move is not None:
+                    return move
+
+        self.left += reserve
+        tail_x, tail_y = snake.body[-1]
+        tail = tail_x + tail_y * w
+        safe = [(move, cell) for move, cell in zip(MOVES, moves)
+                if cell != back and offset + entered[cell] <= 1]
+        if length > 1:
+            best, best_length = None, 0
+            for i, (move, cell) in enumerate(safe):
+                if cell == tail:
+                    route = 1
+                else:
+                    # An even share of what is left for each move still to try; a
+                    # search that spends its share ranks below every route found
+                    share = self.left // (len(safe) - i)
+                    rest = self.left - share
+                    self.left = share
+                    path = self._path(cell, tail, offset, entered, depth=1)
+                    route = 0 if path is None else len(path) + 1 if path else 0.5
+                    self.left += rest
+                if route > best_length:
+                    best, best_length = move, route
+            if best is not None:
+                return best
+            if self.left <= 0:
+                return self._fallback(plan, food, food_pos, snake, moves, back, offset, entered)
+
+        # No safe plan: take the move with the most room behind it
+        best, best_area = snake.direction, -1
+        for move, cell in safe:
+            area = self._area(cell, offset, entered)
+            if area > best_area:
+                best, best_area = move, area
+            if self.left <= 0:
+                break
+        return best
+
+    def _follow(self, plan, food, snake, moves, back, offset, entered):
+        """Next move of ``plan`` if its next cell can be entered now, keeping the rest"""
+        cell = plan[-1]
+        if cell not in moves or cell == back or offset + entered[cell] > 1:
+            return None
+        plan.pop()
+        self.plan = plan
+        self.plan_key = (food, snake.moves + 1)
+        return MOVES[moves.index(cell)]
+
+    def _fallback(self, plan, food, food_pos, snake, moves, back, offset, entered):
+        """Move for a decision that ran out of budget: the old plan, or the first safe move.
+
+        Safe moves are tried nearest the food first, then straight on.
+        """
+        move = plan and self._follow(plan, food, snake, moves, back, offset, entered)
+        if move:
+            return move
+        if food_pos is not None:
+            move = self._closest_move(food_pos, snake.head, moves, back, offset, entered)
+            if move is not None:
+                return move
+        return snake.direction
+
+    def _closest_move(self, food_pos, head_pos, moves, back, offset, entered):
+        """Enterable move that ends nearest the food, wrapping around the board"""
+        w, h = self.grid_width, self.grid_height
+        best, best_distance = None, None
+        for (dx, dy), cell in zip(MOVES, moves):
+            if cell == back or offset + entered[cell] > 1:
+                continue
+            x, y = (head_pos[0] + dx) % w, (head_pos[1] + dy) % h
+            distance_x, distance_y = abs(x - food_pos[0]), abs(y - food_pos[1])
+            distance = min(distance_x, w - distance_x) + min(distance_y, h - distance_y)
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (dx, dy), distance
+        return best
+
+    def _distances(self, target):
+        """Wrapped distances to ``target``'s column and row, indexed by column and row"""
+        target_y, target_x = divmod(target, self.grid_width)
+        # The distances from column 0, rotated to start at the target's column
+        wrap_x, wrap_y = self.wrap_x, self.wrap_y
+        return (wrap_x[len(wrap_x) - target_x:] + wrap_x[:len(wrap_x) - target_x],
+                wrap_y[len(wrap_y) - target_y:] + wrap_y[:len(wrap_y) - target_y])
+
+    def _path(self, start, target, offset, entered, back=None, depth=0, planned=None, to_body=False):
+        """Time-aware A* path from ``start`` to ``target``, excluding ``start``.
+
+        ``depth`` is the number of moves already made to reach ``start``.
+        Returns None when there is no path, or an empty list when the
+        decision's budget ran out first.  With ``planned`` set, cells marked in
+        ``self.planned_mark`` with that search id take their entry move
+        from ``self.planned`` instead of ``entered``.  With ``to_body`` the
+        path may also end on any body segment other than the tail, entered
+        once it has left: the cells it covered then lead on to the tail.
+        """
+        neighbors = self.neighbors
+        parent = self.parent
+        mark = self.mark
+        depths = self.depth
+        planned_mark, planned_moves = self.planned_mark, self.planned
+        w = self.grid_width
+        cells = len(mark)
+        heappush, heappop = heapq.heappush, heapq.heappop
+        self.search += 1
+        search = self.search
+        mark[start] = search
+        if back is not None:
+            mark[back] = search  # never the first move; nothing else is lost as it is adjacent
+        # Frontier keys are plain ints, cheaper to compare than tuples: the A* estimate,
+        # then the deeper cell first, then the cell itself, as
+        # ((depth + distance) * deepest + deepest - depth) * cells + cell.  The wrapped
+        # Manhattan distance to the target is looked up per column and row, pre-scaled
+        deepest = self.left + depth + 2
+        scale = deepest * cells
+        distance_x, distance_y = self._distances(target)
+        distance_x = [distance * scale for distance in distance_x]
+        distance_y = [distance * scale for distance in distance_y]
+        depths[start] = depth
+        frontier = [distance_x[start % w] + distance_y[start // w] + depth * (scale - cells) + scale + start]
+        left = self.left
+        while frontier:
+            if left <= 0:
+                self.left = 0
+                return []
+            left -= 1
+            cell = heappop(frontier) % cells
+            depth = depths[cell] + 1
+            depth_key = depth * (scale - cells) + scale
+            base = cell * 4
+            for neighbor in neighbors[base:base + 4]:
+                if mark[neighbor] == search:
+                    continue
+                if planned is not None and planned_mark[neighbor] == planned:
+                    free_at = offset + planned_moves[neighbor]
+                else:
+                    free_at = offset + entered[neighbor]
+                if free_at > depth:
+                    continue
+                mark[neighbor] = search
+                parent[neighbor] = cell
+                if neighbor == target or to_body and free_at > 1:
+                    self.left = left
+                    path = [neighbor]
+                    while parent[path[-1]] != start:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    return path
+                depths[neighbor] = depth
+                heappush(frontier, distance_x[neighbor % w] + distance_y[neighbor // w] + depth_key + neighbor)
+        self.left = left
+        return None
+
+    def _tail_reachable(self, snake, path):
+        """Could the snake still reach its tail after following ``path`` and eating?
+
+        Searches over the body as it will be then: the path cells entered on
+        the coming moves and the snake one longer, without building it.
+        """
+        w = self.grid_width
+        steps = len(path)
+        # Length on reaching the food, counting a growth still to come
+        length = len(snake) + (1 if snake.grow else 0)
+        moves_now = snake.moves
+        self.search += 1
+        planned = self.search
+        for j, cell in enumerate(path):
+            self.planned_mark[cell] = planned
+            self.planned[cell] = moves_now + j + 1
+        # The tail after the moves: an old segment, or a path cell once the body has moved off
+        if steps < length:
+            tail_x, tail_y = snake.body[length - 1 - steps]
+            tail = tail_x + tail_y * w
+        else:
+            tail = path[steps - length]
+        # Free times from then on, counted from the moment the food is eaten
+        offset = length + 1 - (moves_now + steps)
+        result = self._path(path[-1], tail, offset, snake.entered, planned=planned, to_body=True)
+        return bool(result)
+
+    def _area(self, start, offset, entered):
+        """Number of cells reachable from ``start``, entered after one move, as far as the budget goes"""
+        neighbors = self.neighbors
+        mark = self.mark
+        self.search += 1
+        search = self.search
+        mark[start] = search
+        frontier = [start]
+        count = 1
+        depth = 1
+        while frontier and self.left > 0:
+            depth += 1
+            following = []
+            self.left -= len(frontier)
+            for cell in frontier:
+                base = cell * 4
+                for neighbor in neighbors[base:base + 4]:
+                    if mark[neighbor] != search and offset + entered[neighbor] <= depth:
+                        mark[neighbor] = search
+                        following.append(neighbor)
+            count += len(following)
+            frontier = following
+        return count
+
+
+def play(grid_width, grid_height, seed=None, max_ticks=None):
+    """Play one headless game with the autopilot; returns the game and its pilot"""
+    game = Game(grid_width, grid_height, seed=seed)
+    pilot = Autopilot(grid_width, grid_height, history=100000)
+    max_ticks = max_ticks or 200 * grid_width * grid_height
+    while game.alive and game.ticks < max_ticks:
+        game.step(pilot.decide(game))
+    return game, pilot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless games with the autopilot")
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--width', type=int, default=30)
+    parser.add_argument('--height', type=int, default=23)
+    parser.add_argument('--max-ticks', type=int, help="end games as 'timeout' after this many ticks")
+    args = parser.parse_args()
+
+    cells = args.width * args.height
+    for i in range(args.games):
+        game, pilot = play(args.width, args.height, seed=args.seed + i, max_ticks=args.max_ticks)
+        stats = pilot.decision_stats()
+        result = 'timeout' if game.alive else game.outcome
+        print(f"seed {args.seed + i}: {result:8} score {game.score:5}  length {len(game.snake):4}/{cells}  "
+              f"ticks {game.ticks:6}  decision p50 {stats['p50']:.3f} ms  p99 {stats['p99']:.3f} ms  "
+              f"max {stats['max']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
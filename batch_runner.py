@@ -0,0 +1,257 @@
+"""Play large numbers of headless games across all cores.
+
+Games are numbered from ``--seed`` and game ``n`` uses seed ``n`` for both
+its board and its policy, so any game can be replayed on its own and the
+totals do not depend on the number of workers or the unit size.  Workers
+play units of ``--unit`` games in a ``ProcessPoolExecutor`` and send back a
+small result tuple per game; the parent folds them into running totals, and
+optionally appends them to a JSON lines file, with only a few units in
+flight at a time, so memory stays flat however many games are played::
+
+    python batch_runner.py --games 100000 --policy greedy --output games.jsonl
+    python batch_runner.py --games 200 --policy autopilot --width 20 --height 15
+
+A policy is a factory ``policy(grid_width, grid_height, seed)`` returning a
+callable that takes the ``Game`` and returns a direction, or None to keep
+going straight.  Besides the built-in names in ``POLICIES``, ``--policy``
+accepts ``module:factory`` for bots defined elsewhere.
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from autopilot import Autopilot
+from engine import DIRECTIONS, MIN_MOVE_DELAY, Game
+
+PERCENTILES = (50, 90, 99)
+UNITS_PER_WORKER = 2  # units queued per worker beyond the ones running
+
+GameResult = namedtuple('GameResult', [
+    'seed',
+    'outcome',      # 'won', 'collided' or 'timeout'
+    'score',
+    'length',
+    'ticks',
+    'game_ms',      # game time at the speed the snake was moving, in milliseconds
+    'move_delay',   # move delay when the game ended
+])
+
+
+def random_policy(grid_width, grid_height, seed, turn_rate=0.2):
+    """Turns at random on ``turn_rate`` of the ticks"""
+    rng = random.Random(seed)
+    turns = list(DIRECTIONS.values())
+
+    def policy(game):
+        return rng.choice(turns) if rng.random() < turn_rate else None
+    return policy
+
+
+def greedy_policy(grid_width, grid_height, seed):
+    """Steps towards the food by wrapped distance, avoiding only the next cell's body"""
+    rng = random.Random(seed)
+    turns = list(DIRECTIONS.values())
+
+    def policy(game):
+        snake = game.snake
+        (x, y), (food_x, food_y) = snake.head, game.food_pos
+        rng.shuffle(turns)  # break ties without a bias towards one direction
+        best, best_distance = None, None
+        for dx, dy in turns:
+            if not snake.can_turn((dx, dy)):
+                continue
+            nx, ny = (x + dx) % grid_width, (y + dy) % grid_height
+            if snake.occupies((nx, ny)) and (nx, ny) != snake.body[-1]:
+                continue
+            distance_x, distance_y = abs(nx - food_x), abs(ny - food_y)
+            distance = (min(distance_x, grid_width - distance_x)
+                        + min(distance_y, grid_height - distance_y))
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (dx, dy), distance
+        return best
+    return policy
+
+
+def autopilot_policy(grid_width, grid_height, seed):
+    """The planning bot from autopilot.py; it is deterministic, so ``seed`` is unused"""
+    return Autopilot(grid_width, grid_height, history=1)
+
+
+POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_policy,
+    'autopilot': autopilot_policy,
+}
+
+
+def load_policy(name):
+    """Policy factory by built-in name or as ``module:factory``"""
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, factory = name.partition(':')
+    if not factory:
+        raise ValueError(f"unknown policy {name!r}: use one of {sorted(POLICIES)} or module:factory")
+    return getattr(importlib.import_module(module), factory)
+
+
+def play_game(factory, grid_width, grid_height, seed, max_ticks):
+    game = Game(grid_width, grid_height, seed=seed)
+    policy = factory(grid_width, grid_height, seed)
+    game_ms = 0
+    while game.alive and game.ticks < max_ticks:
+        game_ms += game.move_delay
+        game.step(policy(game))
+    outcome = 'timeout' if game.alive else game.outcome
+    return GameResult(seed, outcome, game.score, len(game.snake), game.ticks, game_ms, game.move_delay)
+
+
+def play_unit(policy_name, first_seed, count, grid_width, grid_height, max_ticks):
+    """Work unit run in a worker process: games ``first_seed`` to ``first_seed + count - 1``"""
+    factory = load_policy(policy_name)
+    return [play_game(factory, grid_width, grid_height, seed, max_ticks)
+            for seed in range(first_seed, first_seed + count)]
+
+
+class Summary:
+    """Running totals over game results, in memory independent of the game count.
+
+    Integer metrics are kept as value histograms, which give exact
+    percentiles; their size is bounded by the board (score, length) and
+    ``max_ticks`` (ticks), not by the number of games.
+    """
+
+    METRICS = ('score', 'length', 'ticks')
+
+    def __init__(self):
+        self.games = 0
+        self.outcomes = Counter()
+        self.histograms = {metric: Counter() for metric in self.METRICS}
+        self.game_ms = 0
+        self.top_speed = 0  # games that reached MIN_MOVE_DELAY
+
+    def add(self, result):
+        self.games += 1
+        self.outcomes[result.outcome] += 1
+        for metric in self.METRICS:
+            self.histograms[metric][getattr(result, metric)] += 1
+        self.game_ms += result.game_ms
+        self.top_speed += result.move_delay == MIN_MOVE_DELAY
+
+    def report(self):
+        report = {
+            'games': self.games,
+            'outcomes': dict(self.outcomes.most_common()),
+        }
+        if not self.games:
+            return report
+        for metric in self.METRICS:
+            report[metric] = self._stats(self.histograms[metric])
+        report['mean_game_seconds'] = round(self.game_ms / self.games / 1000, 2)
+        report['reached_top_speed'] = round(self.top_speed / self.games, 4)
+        return report
+
+    def _stats(self, histogram):
+        values = sorted(histogram)
+        stats = {
+            'mean': round(sum(value * n for value, n in histogram.items()) / self.games, 2),
+            'min': values[0],
+            'max': values[-1],
+        }
+        # Walk the sorted values once, picking off each percentile's rank
+        ranks = [(q, max(1, -(-q * self.games // 100))) for q in PERCENTILES]
+        seen = 0
+        for value in values:
+            seen += histogram[value]
+            while ranks and seen >= ranks[0][1]:
+                stats[f'p{ranks.pop(0)[0]}'] = value
+        return stats
+
+
+def run(policy, games, first_seed=0, grid_width=30, grid_height=23, max_ticks=None,
+        workers=None, unit=25, on_result=None):
+    """Play ``games`` games over a process pool; returns the Summary.
+
+    ``on_result`` is called in this process with each GameResult as its
+    unit comes back; units finish out of order.
+    """
+    load_policy(policy)  # fail here rather than in every worker
+    workers = workers or os.cpu_count() or 1
+    max_ticks = max_ticks or 200 * grid_width * grid_height
+    summary = Summary()
+    end = first_seed + games
+    units = ((first, min(unit, end - first)) for first in range(first_seed, end, unit))
+
+    def collect(futures):
+        for future in futures:
+            for result in future.result():
+                summary.add(result)
+                if on_result:
+                    on_result(result)
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        for first, count in units:
+            pending.add(pool.submit(play_unit, policy, first, count, grid_width, grid_height, max_ticks))
+            if len(pending) >= workers * (1 + UNITS_PER_WORKER):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(pending)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--policy', default='greedy',
+                        help=f"one of {', '.join(POLICIES)}, or module:factory")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--width', type=int, default=30)
+    parser.add_argument('--height', type=int, default=23)
+    parser.add_argument('--max-ticks', type=int, help="end games as 'timeout' after this many ticks")
+    parser.add_argument('--workers', type=int, help="worker processes (default: all cores)")
+    parser.add_argument('--unit', type=int, default=25, help="games per work unit")
+    parser.add_argument('--output', help="append one JSON line per game to this file")
+    args = parser.parse_args()
+    try:
+        load_policy(args.policy)
+    except (ValueError, ImportError, AttributeError) as error:
+        parser.error(str(error))
+
+    output = open(args.output, 'a') if args.output else None
+    played = 0
+    start = time.perf_counter()
+
+    def on_result(result):
+        nonlocal played
+        played += 1
+        if output:
+            output.write(json.dumps(result._asdict()) + '\n')
+        if played % 1000 == 0:
+            rate = played / (time.perf_counter() - start)
+            print(f"{played}/{args.games} games, {rate:.0f} games/s", file=sys.stderr)
+
+    try:
+        summary = run(args.policy, args.games, args.seed, args.width, args.height, args.max_ticks,
+                      args.workers, args.unit, on_result)
+    finally:
+        if output:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    report = summary.report()
+    report['policy'] = args.policy
+    report['board'] = f'{args.width}x{args.height}'
+    report['workers'] = args.workers or os.cpu_count()
+    report['seconds'] = round(elapsed, 2)
+    report['games_per_second'] = round(summary.games / elapsed, 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
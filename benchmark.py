@@ -0,0 +1,354 @@
+"""Headless render and logic benchmarks.
+
+Runs the game's drawing functions and engine under SDL's dummy video driver
+with scripted workloads (snake length, particle count, board size) and
+prints per-call timings as JSON, so runs from two commits can be compared::
+
+    python benchmark.py --output before.json
+    python benchmark.py --compare before.json
+
+Timings are in microseconds per call.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+import app
+from camera import Camera
+from engine import Game, Snake
+from particles import ParticleSystem
+from vector_env import VectorGame
+
+SNAKE_LENGTHS = (1, 10, 50, 150, 300, 600)
+PARTICLE_COUNTS = (0, 100, 1000, 4000)
+BOARD_SIZES = ((30, 23), (64, 64), (256, 256))
+VECTOR_GAMES = (256, 4096)
+LARGE_BOARD = (500, 500)
+LARGE_SNAKE_LENGTHS = (10, 600, 50000)
+PERCENTILES = (50, 90, 99)
+COLD_START_RUNS = 7
+
+# Run in a fresh interpreter: import the game and present the first start screen frame
+COLD_START_SCRIPT = """
+import time
+start = time.perf_counter()
+import pygame
+import app
+app.init_display()
+particles = app.ParticleSystem()
+app.draw_start_screen(app.screen, particles).draw(app.screen)
+pygame.display.flip()
+print((time.perf_counter() - start) * 1e6)
+"""
+
+
+def hamiltonian_cycle(width, height):
+    """Cells of a cycle through every cell of the board, each adjacent to the next.
+
+    Snakes laid out along it can move forever without hitting themselves.
+    One side of the board must be even.
+    """
+    if height % 2 and width % 2:
+        raise ValueError("a Hamiltonian cycle needs an even board side")
+    if height % 2:
+        return [(x, y) for y, x in hamiltonian_cycle(height, width)]
+    # Serpentine over columns 1.., back up column 0
+    cells = []
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cells.extend((x, y) for x in xs)
+    cells.extend((0, y) for y in range(height - 1, -1, -1))
+    return cells
+
+
+def laid_out_snake(width, height, length):
+    """A snake of ``length`` cells lying along the board's Hamiltonian cycle.
+
+    Returns the snake and a function that points it along the cycle, so
+    each following move() stays on it.
+    """
+    cycle = hamiltonian_cycle(width, height)
+    if length > len(cycle):
+        raise ValueError(f"a {width}x{height} board cannot hold a snake of {length}")
+    snake = Snake(width, height)
+    snake.occupied[:] = bytes(width * height)
+    for x, y in snake.body:
+        snake.free.add(y * width + x)
+    snake.body.clear()
+    for x, y in reversed(cycle[:length]):
+        snake.body.append((x, y))
+        snake.occupied[y * width + x] = 1
+        snake.free.remove(y * width + x)
+    for i, (x, y) in enumerate(snake.body):
+        snake.entered[y * width + x] = snake.moves - i
+
+    index = {cell: i for i, cell in enumerate(cycle)}
+
+    def steer():
+        x, y = snake.body[0]
+        nx, ny = cycle[(index[(x, y)] + 1) % len(cycle)]
+        snake.direction = (nx - x, ny - y)
+
+    steer()
+    return snake, steer
+
+
+def filled_particles(count):
+    """A particle system full of ``count`` long-lived particles.
+
+    Its capacity is ``count``, so particles the draw calls emit are dropped
+    and the workload stays the same from one iteration to the next.
+    """
+    particles = ParticleSystem(capacity=max(count, 1), seed=0)
+    if count:
+        particles.emit(app.WIDTH / 2, app.HEIGHT / 2, [app.SNAKE_HEAD, app.FOOD_COLOR],
+                       speed=0.5, life=10 ** 9, count=count, jitter=(app.WIDTH / 2, app.HEIGHT / 2))
+    return particles
+
+
+def measure(func, iterations, warmup=10, setup=None):
+    """Per-call timing statistics of ``func()`` in microseconds"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    samples = np.empty(iterations)
+    perf_counter_ns = time.perf_counter_ns
+    for i in range(iterations):
+        if setup:
+            setup()
+        start = perf_counter_ns()
+        func()
+        samples[i] = perf_counter_ns() - start
+    return summarize(samples / 1000)
+
+
+def summarize(samples):
+    stats = {f'p{q}': round(float(np.percentile(samples, q)), 3) for q in PERCENTILES}
+    stats['mean'] = round(float(samples.mean()), 3)
+    stats['max'] = round(float(samples.max()), 3)
+    return stats
+
+
+def bench_drawing(iterations):
+    screen = app.screen
+    scratch = ParticleSystem(seed=0)  # collects the particles the draw calls emit
+    width, height = app.GRID_WIDTH, app.GRID_HEIGHT
+    if width % 2 and height % 2:
+        width -= 1
+    food_pos = (0, 0)
+
+    yield 'draw_grid', {}, measure(lambda: app.draw_grid(screen), iterations)
+    yield 'draw_food', {}, measure(lambda: app.draw_food(screen, food_pos, scratch), iterations,
+                                   setup=scratch.clear)
+    for length in SNAKE_LENGTHS:
+        snake, _ = laid_out_snake(width, height, length)
+        yield 'draw_snake', {'length': length}, measure(
+            lambda: app.draw_snake(screen, snake, scratch), iterations, setup=scratch.clear)
+
+    for count in PARTICLE_COUNTS:
+        particles = filled_particles(count)
+        yield 'particles_update', {'count': count}, measure(particles.update, iterations)
+        yield 'particles_draw', {'count': count}, measure(lambda: particles.draw(screen), iterations)
+
+
+def bench_logic(iterations):
+    for width, height in BOARD_SIZES:
+        for length in SNAKE_LENGTHS:
+            if length > width * height:
+                continue
+            snake, steer = laid_out_snake(width, height, length)
+            yield 'snake_move', {'board': f'{width}x{height}', 'length': length}, measure(
+                snake.move, iterations, setup=steer)
+
+        game = Game(width, height, seed=0)
+        rng = random.Random(0)
+        turns = list(app.DIRECTIONS.values())
+
+        def step():
+            if not game.alive:
+                game.reset()
+            game.step(rng.choice(turns) if rng.random() < 0.2 else None)
+
+        yield 'game_step', {'board': f'{width}x{height}'}, measure(step, iterations)
+
+    # Batched games; divide by the game count for the time per env-step
+    width, height = BOARD_SIZES[0]
+    for count in VECTOR_GAMES:
+        games = VectorGame(count, width, height, seed=0)
+        actions = np.random.default_rng(0).integers(-1, 4, (64, count))
+        ticks = iter(range(10 ** 9))
+        yield 'vector_step', {'games': count}, measure(
+            lambda: games.step(actions[next(ticks) % len(actions)]), iterations)
+
+
+def bench_frames(iterations):
+    """Whole frames of each game state, composed the way main() draws them"""
+    screen = app.screen
+    width, height = app.GRID_WIDTH, app.GRID_HEIGHT
+    if width % 2 and height % 2:
+        width -= 1
+
+    particles = filled_particles(0)
+
+    def start_screen():
+        app.draw_start_screen(screen, particles).draw(screen)
+
+    yield 'frame_start_screen', {}, measure(start_screen, iterations)
+
+    for length in SNAKE_LENGTHS:
+        for count in (0, 1000):
+            snake, _ = laid_out_snake(width, height, length)
+            particles = filled_particles(count)
+
+            def playing():
+                app.static_layers.blit('background', screen)
+                particles.update()
+                particles.draw(screen)
+                app.draw_snake(screen, snake, particles)
+                app.draw_food(screen, (0, 0), particles)
+                app.draw_ui(screen, 1230, 4560)
+
+            yield 'frame_playing', {'length': length, 'particles': count}, measure(playing, iterations)
+
+    particles = filled_particles(0)
+
+    def game_over():
+        app.static_layers.blit('game_over_backdrop', screen)
+        particles.update()
+        particles.draw(screen)
+        app.draw_game_over(screen, 120, 340, particles)
+
+    yield 'frame_game_over', {}, measure(game_over, iterations)
+
+    # A scrolling board; culling should keep these flat as the snake grows
+    width, height = LARGE_BOARD
+    camera = Camera(app.WIDTH, app.HEIGHT, width, height, app.GRID_SIZE)
+    for length in LARGE_SNAKE_LENGTHS:
+        snake, _ = laid_out_snake(width, height, length)
+        head_x, head_y = snake.head
+        camera.follow(head_x * app.GRID_SIZE, head_y * app.GRID_SIZE)
+        particles = filled_particles(0)
+
+        def scrolling():
+            app.draw_scrolling_background(screen, camera)
+            particles.update()
+            particles.draw(screen)
+            app.draw_snake(screen, snake, particles, alpha=0.5, camera=camera)
+            app.draw_food(screen, (0, 0), particles, camera=camera)
+            app.draw_ui(screen, 1230, 4560)
+
+        yield 'frame_scrolling', {'board': f'{width}x{height}', 'length': length}, measure(
+            scrolling, iterations)
+
+
+def bench_startup(iterations):
+    """Cold start to the first start screen frame, in fresh interpreters.
+
+    Runs COLD_START_RUNS times whatever ``iterations`` is.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(COLD_START_RUNS):
+        output = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], cwd=here, env=os.environ,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.split()[-1]))
+    yield 'cold_start', {}, summarize(np.array(samples))
+
+
+def run(groups, iterations):
+    random.seed(0)
+    results = []
+    for group in groups:
+        for name, params, stats in group(iterations):
+            results.append({'name': name, 'params': params, **stats})
+            label = ' '.join(f'{k}={v}' for k, v in params.items())
+            print(f"{name:20} {label:28} p50 {stats['p50']:10.1f} us  p99 {stats['p99']:10.1f} us",
+                  file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'iterations': iterations,
+            'unit': 'us',
+        },
+        'results': results,
+    }
+
+
+def result_key(result):
+    return result['name'], tuple(sorted(result['params'].items()))
+
+
+def compare(report, baseline, threshold):
+    """Print p50 changes against a baseline report; returns the regressions"""
+    previous = {result_key(r): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        old = previous.get(result_key(result))
+        if not old or not old['p50']:
+            continue
+        ratio = result['p50'] / old['p50']
+        label = ' '.join(f'{k}={v}' for k, v in result['params'].items())
+        flag = '  REGRESSION' if ratio > 1 + threshold else ''
+        print(f"{result['name']:20} {label:28} {old['p50']:10.1f} -> {result['p50']:10.1f} us "
+              f"({ratio:5.2f}x){flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+GROUPS = {
+    'drawing': bench_drawing,
+    'logic': bench_logic,
+    'frames': bench_frames,
+    'startup': bench_startup,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--only', choices=sorted(GROUPS), action='append',
+                        help="run only this group (repeatable)")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="compare p50 timings against an earlier JSON report")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="relative p50 slowdown reported as a regression")
+    args = parser.parse_args()
+
+    app.init_display()
+    groups = [GROUPS[name] for name in (args.only or GROUPS)]
+    report = run(groups, args.iterations)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
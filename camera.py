@@ -0,0 +1,102 @@
+"""Window-sized view onto a wrap-around board that may be larger than the window."""
+import math
+
+EDGE_CELLS = 1  # cells drawn past each edge of the view, for segments sliding in
+
+
+class Camera:
+    """Maps world pixels to screen pixels, following a point on the board.
+
+    On an axis where the board fits in the window the camera stays at 0 and
+    the mapping is the identity, so a window-sized board draws exactly as it
+    always has.  On a scrolling axis the view is centered on the followed
+    point and wraps around with the board.
+    """
+
+    def __init__(self, view_width, view_height, grid_width, grid_height, cell_size):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cell_size = cell_size
+        self.world_width = grid_width * cell_size
+        self.world_height = grid_height * cell_size
+        # The background layer and grid cover the whole window, so a board
+        # must fill it: a smaller one would wrap in the middle of the grid
+        if grid_width < view_width // cell_size or grid_height < view_height // cell_size:
+            raise ValueError(f"a board must be at least {view_width // cell_size}x{view_height // cell_size} "
+                             f"cells to fill the {view_width}x{view_height} window")
+        self.scroll_x = self.world_width > view_width
+        self.scroll_y = self.world_height > view_height
+        # A cell must never show up at both edges of the view at once
+        margin = 2 * (EDGE_CELLS + 1) * cell_size
+        if (self.scroll_x and self.world_width < view_width + margin
+                or self.scroll_y and self.world_height < view_height + margin):
+            raise ValueError(f"a board must fit in the {view_width}x{view_height} window or be at least "
+                             f"{2 * (EDGE_CELLS + 1)} cells larger than it along each scrolling side")
+        self.x = 0  # world pixel at the top left of the view
+        self.y = 0
+
+    @property
+    def scrolling(self):
+        return self.scroll_x or self.scroll_y
+
+    def follow(self, x, y):
+        """Center the view on world pixel (x, y); returns how far it moved, (dx, dy)"""
+        old_x, old_y = self.x, self.y
+        if self.scroll_x:
+            self.x = int(x - self.view_width // 2) % self.world_width
+        if self.scroll_y:
+            self.y = int(y - self.view_height // 2) % self.world_height
+        return (int(self._wrapped(self.x - old_x, self.world_width)),
+                int(self._wrapped(self.y - old_y, self.world_height)))
+
+    @staticmethod
+    def _wrapped(delta, size):
+        """Shortest signed distance for a move of ``delta`` around a loop of ``size``"""
+        return (delta + size / 2) % size - size / 2
+
+    def to_screen(self, x, y):
+        """Screen position of world pixel (x, y)"""
+        margin = (EDGE_CELLS + 1) * self.cell_size
+        if self.scroll_x:
+            x = (x - self.x + margin) % self.world_width - margin
+        if self.scroll_y:
+            y = (y - self.y + margin) % self.world_height - margin
+        return x, y
+
+    def edge_point(self, x, y, inset):
+        """Screen point ``inset`` pixels inside the border, towards world pixel (x, y).
+
+        The direction is the short way round the board, for pointing at
+        things out of view.
+        """
+        center_x, center_y = self.view_width / 2, self.view_height / 2
+        dx = x - (self.x + center_x)
+        dy = y - (self.y + center_y)
+        if self.scroll_x:
+            dx = self._wrapped(dx, self.world_width)
+        if self.scroll_y:
+            dy = self._wrapped(dy, self.world_height)
+        scale = min((center_x - inset) / abs(dx) if dx else math.inf,
+                    (center_y - inset) / abs(dy) if dy else math.inf)
+        if scale == math.inf:
+            return center_x, center_y
+        return center_x + dx * scale, center_y + dy * scale
+
+    def cell_visible(self, sx, sy):
+        """True if a cell drawn at screen position (sx, sy) overlaps the view"""
+        size = self.cell_size
+        return -size < sx < self.view_width and -size < sy < self.view_height
+
+    def visible_cells(self):
+        """Column and row indices in view, plus EDGE_CELLS on every side, wrapped"""
+        return (self._visible(self.x, self.view_width, self.grid_width, self.scroll_x),
+                self._visible(self.y, self.view_height, self.grid_height, self.scroll_y))
+
+    def _visible(self, offset, view, cells, scrolls):
+        if not scrolls:
+            return list(range(cells))
+        first = offset // self.cell_size - EDGE_CELLS
+        last = (offset + view - 1) // self.cell_size + EDGE_CELLS
+        return [i % cells for i in range(first, last + 1)]
@@ -0,0 +1,66 @@
+"""Dirty-rectangle presentation for displays where the full-frame upload is expensive."""
+import pygame
+
+DEFAULT_THRESHOLD = 0.4  # fraction of the screen above which a full flip is used
+
+
+class DirtyRectRenderer:
+    """Pushes only the regions that changed since the last frame.
+
+    Each frame, ``begin()`` erases what was drawn last frame by restoring the
+    background under those rects, the caller draws and reports the rects it
+    touched through ``add()``, and ``present()`` updates the display with the
+    old and new rects together.  When that area passes ``threshold`` of the
+    screen, or after ``invalidate()``, it falls back to a full flip.
+    """
+
+    def __init__(self, screen, threshold=DEFAULT_THRESHOLD):
+        self.screen = screen
+        self.threshold = threshold
+        self.previous = []
+        self.current = []
+        self.full_redraw = True
+        self.full_flips = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        """Force a full redraw and flip on the next frame"""
+        self.full_redraw = True
+
+    def begin(self, restore):
+        """Erase last frame's drawing; ``restore(rect)`` repaints the background"""
+        if self.full_redraw:
+            restore(self.screen.get_rect())
+        else:
+            for rect in self.previous:
+                restore(rect)
+
+    def add(self, rects):
+        """Record a rect, or a list of rects, drawn this frame"""
+        if isinstance(rects, pygame.Rect):
+            self.current.append(rects)
+        else:
+            self.current.extend(rects)
+
+    def present(self):
+        screen_rect = self.screen.get_rect()
+        current = [rect.clip(screen_rect) for rect in self.current]
+        current = [rect for rect in current if rect.w and rect.h]
+
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_flips += 1
+        else:
+            rects = self.previous + current
+            # Overlaps are counted twice, which only errs towards flipping
+            area = sum(rect.w * rect.h for rect in rects)
+            if area > self.threshold * screen_rect.w * screen_rect.h:
+                pygame.display.flip()
+                self.full_flips += 1
+            else:
+                pygame.display.update(rects)
+                self.partial_updates += 1
+
+        self.previous = current
+        self.current = []
+        self.full_redraw = False
@@ -0,0 +1,237 @@
+"""Headless snake game core.
+
+Holds the board, the snake, food, score and the speed-up rule without any
+pygame or wall-clock dependency.  ``Game.step()`` advances exactly one logic
+tick, so the pygame front end, bots and benchmarks can all drive the same
+rules at whatever rate they like.
+"""
+import random
+from collections import deque, namedtuple
+
+# Directions as (dx, dy) grid offsets
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = {'UP': UP, 'DOWN': DOWN, 'LEFT': LEFT, 'RIGHT': RIGHT}
+
+# Gameplay rules
+INITIAL_MOVE_DELAY = 120  # milliseconds per tick at the start of a game
+MIN_MOVE_DELAY = 70       # fastest the snake can get
+SPEEDUP_PER_FOOD = 1      # milliseconds shaved off per food eaten
+FOOD_SCORE = 10
+TURN_BUFFER = 2           # turns remembered for the following ticks
+
+StepResult = namedtuple('StepResult', ['alive', 'ate'])
+
+
+class FreeCells:
+    """Set of free cell indices with O(1) add, remove and uniform sampling.
+
+    ``cells`` is a dense array of the free indices and ``slots`` maps each
+    cell index to its position in ``cells`` (-1 when occupied), so removal is
+    a swap with the last entry followed by a pop.
+    """
+
+    def __init__(self, size):
+        self.cells = list(range(size))
+        self.slots = list(range(size))
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, index):
+        return self.slots[index] >= 0
+
+    def add(self, index):
+        self.slots[index] = len(self.cells)
+        self.cells.append(index)
+
+    def remove(self, index):
+        slot = self.slots[index]
+        last = self.cells.pop()
+        if last != index:
+            self.cells[slot] = last
+            self.slots[last] = slot
+        self.slots[index] = -1
+
+    def sample(self, rng):
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class Snake:
+    """Snake body kept as a deque plus a flat occupancy bitmap.
+
+    The deque gives O(1) head insert and tail pop, and ``occupied`` (one byte
+    per cell, indexed ``y * grid_width + x``) gives O(1) self-collision and
+    cell lookups regardless of the snake's length.  ``free`` tracks every
+    cell the snake does not cover so food can be placed in O(1).
+    ``entered`` holds the move on which the head last entered each cell, so
+    the segment covering a cell is ``moves - entered[cell]`` back from the
+    head, found without walking the body.
+    """
+
+    def __init__(self, grid_width, grid_height):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        center_x = grid_width // 2
+        center_y = grid_height // 2
+        self.body = deque([(center_x, center_y)])
+        self.occupied = bytearray(grid_width * grid_height)
+        self.occupied[center_y * grid_width + center_x] = 1
+        self.free = FreeCells(grid_width * grid_height)
+        self.free.remove(center_y * grid_width + center_x)
+        self.moves = 0
+        self.entered = [0] * (grid_width * grid_height)
+        self.direction = RIGHT
+        self.grow = False
+        self.last_tail = None  # cell the tail left on the last move, None if it grew
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    def __len__(self):
+        return len(self.body)
+
+    def occupies(self, pos):
+        return self.occupied[pos[1] * self.grid_width + pos[0]] == 1
+
+    def move(self):
+        """Advance one cell; returns False on self collision"""
+        head = self.body[0]
+        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
+
+        # Wrap around boundaries instead of collision
+        new_head = (new_head[0] % self.grid_width, new_head[1] % self.grid_height)
+        new_index = new_head[1] * self.grid_width + new_head[0]
+
+        # Check for self collision; the tail cell is free to enter unless
+        # the snake is growing this tick, since the tail leaves it
+        if self.occupied[new_index] and (self.grow or new_head != self.body[-1]):
+            return False
+
+        if not self.grow:
+            tail = self.body.pop()
+            tail_index = tail[1] * self.grid_width + tail[0]
+            self.occupied[tail_index] = 0
+            self.free.add(tail_index)
+            self.last_tail = tail
+        else:
+            self.grow = False
+            self.last_tail = None
+
+        self.body.appendleft(new_head)
+        self.occupied[new_index] = 1
+        self.free.remove(new_index)
+        self.moves += 1
+        self.entered[new_index] = self.moves
+        return True
+
+    def segment_at(self, index):
+        """Position in the body (0 for the head) of the segment on cell ``index``, or None"""
+        if not self.occupied[index]:
+            return None
+        return self.moves - self.entered[index]
+
+    def can_turn(self, new_direction):
+        """True unless ``new_direction`` would reverse the snake onto itself"""
+        return (-new_direction[0], -new_direction[1]) != self.direction
+
+    def set_direction(self, new_direction):
+        # Prevent immediate reversal
+        new_direction = tuple(new_direction)
+        if self.can_turn(new_direction):
+            self.direction = new_direction
+
+
+class Game:
+    """One game of snake, advanced a tick at a time by step()"""
+
+    def __init__(self, grid_width, grid_height, seed=None):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        self.snake = Snake(self.grid_width, self.grid_height)
+        self.turns = deque()
+        self.food_pos = None
+        self.score = 0
+        self.ticks = 0
+        self.alive = True
+        self.won = False
+        self.move_delay = INITIAL_MOVE_DELAY
+        self.spawn_food()
+
+    @property
+    def outcome(self):
+        """How the game stands: 'playing', 'won' or 'collided' (ran into itself)"""
+        if self.alive:
+            return 'playing'
+        return 'won' if self.won else 'collided'
+
+    def spawn_food(self):
+        """Place food on a uniformly random free cell.
+
+        Returns False when the snake covers the whole board.
+        """
+        if not self.snake.free:
+            self.food_pos = None
+            return False
+        y, x = divmod(self.snake.free.sample(self.rng), self.grid_width)
+        self.food_pos = (x, y)
+        return True
+
+    def can_queue(self, direction):
+        """True if ``direction`` is a real turn after the turns already queued"""
+        last = self.turns[-1] if self.turns else self.snake.direction
+        return direction != last and (-direction[0], -direction[1]) != last
+
+    def queue_turn(self, direction):
+        """Buffer a turn for the coming ticks, one turn per tick.
+
+        Each turn is checked against the one queued before it, so two quick
+        turns (say UP then LEFT while moving RIGHT) both apply on successive
+        ticks instead of the second overwriting the first or reversing the
+        snake.  Returns False if the turn was rejected or the buffer is full.
+        """
+        direction = tuple(direction)
+        if len(self.turns) >= TURN_BUFFER or not self.can_queue(direction):
+            return False
+        self.turns.append(direction)
+        return True
+
+    def step(self, action=None):
+        """Advance one tick, optionally turning towards ``action`` first.
+
+        Without an ``action`` the oldest queued turn, if any, is used.
+        """
+        if not self.alive:
+            return StepResult(False, False)
+
+        if action is None and self.turns:
+            action = self.turns.popleft()
+        if action is not None:
+            self.snake.set_direction(action)
+
+        self.ticks += 1
+        if not self.snake.move():
+            self.alive = False
+            return StepResult(False, False)
+
+        # Check for food collision
+        if self.snake.head == self.food_pos:
+            self.snake.grow = True
+            self.score += FOOD_SCORE
+            # Increase speed slightly
+            self.move_delay = max(MIN_MOVE_DELAY, self.move_delay - SPEEDUP_PER_FOOD)
+            if not self.spawn_food():
+                # Snake fills the board: the game is won
+                self.won = True
+                self.alive = False
+                return StepResult(False, True)
+            return StepResult(True, True)
+
+        return StepResult(True, False)
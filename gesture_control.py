@@ -4,16 +4,15 @@ import numpy as np
 import pyautogui
 import time
 
+from swipe import SwipeRecognizer
+
 # Mediapipe hand detector
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7)
 mp_draw = mp.solutions.drawing_utils
 
-# Swipe detection variables
-prev_x, prev_y = 0, 0
-swipe_threshold = 60  # Minimum pixel movement to count as swipe
-cooldown = 1.0        # Minimum seconds between swipes
-last_swipe_time = time.time()
+# Swipe detection: fires on fingertip velocity (frame widths per second)
+recognizer = SwipeRecognizer()
 
 # Webcam
 cap = cv2.VideoCapture(0)
@@ -24,7 +23,6 @@ while cap.isOpened():
         break
 
     frame = cv2.flip(frame, 1)  # Mirror image
-    h, w, _ = frame.shape
 
     rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     result = hands.process(rgb_frame)
@@ -32,34 +30,21 @@ while cap.isOpened():
     if result.multi_hand_landmarks:
         for hand_landmarks in result.multi_hand_landmarks:
             # Index fingertip position (landmark 8)
-            x = int(hand_landmarks.landmark[8].x * w)
-            y = int(hand_landmarks.landmark[8].y * h)
-
-            dx = x - prev_x
-            dy = y - prev_y
-
-            # Only trigger swipe if enough time has passed
-            current_time = time.time()
-            if current_time - last_swipe_time > cooldown:
-                if abs(dx) > abs(dy) and abs(dx) > swipe_threshold:
-                    if dx > 0:
-                        print("➡️ Swipe Right")
-                        pyautogui.press('right')
-                    else:
-                        print("⬅️ Swipe Left")
-                        pyautogui.press('left')
-                    last_swipe_time = current_time
-
-                elif abs(dy) > swipe_threshold:
-                    if dy < 0:
-                        print("⬆️ Swipe Up (Jump)")
-                        pyautogui.press('up')
-                    else:
-                        print("⬇️ Swipe Down (Roll)")
-                        pyautogui.press('down')
-                    last_swipe_time = current_time
-
-            prev_x, prev_y = x, y
+            tip = hand_landmarks.landmark[8]
+            direction = recognizer.update(tip.x, tip.y, time.monotonic())
+
+            if direction == 'RIGHT':
+                print("➡️ Swipe Right")
+                pyautogui.press('right')
+            elif direction == 'LEFT':
+                print("⬅️ Swipe Left")
+                pyautogui.press('left')
+            elif direction == 'UP':
+                print("⬆️ Swipe Up (Jump)")
+                pyautogui.press('up')
+            elif direction == 'DOWN':
+                print("⬇️ Swipe Down (Roll)")
+                pyautogui.press('down')
 
             mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
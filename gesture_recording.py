@@ -0,0 +1,389 @@
+"""Record camera frames and hand landmarks, and replay them without a webcam.
+
+A recording is a stream of tagged records::
+
+    header   b'SNKREC1\\n'
+    record   tag (1 byte), timestamp (float64 seconds), payload length (uint32), payload
+
+with tag ``F`` for a JPEG-encoded frame and ``L`` for a float32 (21, 2)
+array of normalized landmarks (empty payload when no hand was found).
+``ReplayCapture`` plays the frames back through the same interface as
+``cv2.VideoCapture``, so ``GestureController(camera_index=path)`` runs the
+whole gesture pipeline from a file.
+
+Usage::
+
+    python gesture_recording.py record swipes.snkrec --seconds 20 --landmarks
+    python gesture_recording.py bench swipes.snkrec [--pipeline | --landmarks] [--json]
+"""
+import argparse
+import json
+import struct
+import time
+
+import cv2
+import numpy as np
+
+MAGIC = b'SNKREC1\n'
+RECORD = struct.Struct('<cdI')
+FRAME = b'F'
+LANDMARKS = b'L'
+PIPELINE_MODEL_TIMEOUT = 30  # seconds bench --pipeline waits for the worker's hand model
+
+
+class Recorder:
+    """Append frames and landmark sets to a recording file"""
+
+    def __init__(self, path, jpeg_quality=90):
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+        self.jpeg_quality = jpeg_quality
+        self.frames = 0
+
+    def add_frame(self, frame, timestamp):
+        ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError("could not encode frame")
+        self._write(FRAME, timestamp, encoded.tobytes())
+        self.frames += 1
+
+    def add_landmarks(self, landmarks, timestamp):
+        payload = b'' if landmarks is None else np.asarray(landmarks, dtype=np.float32).tobytes()
+        self._write(LANDMARKS, timestamp, payload)
+
+    def _write(self, tag, timestamp, payload):
+        self.file.write(RECORD.pack(tag, timestamp, len(payload)))
+        self.file.write(payload)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_recording(path):
+    """True if ``path`` is a file in this recording format"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_records(path):
+    """Yield (tag, timestamp, payload) for every record in a recording"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a gesture recording")
+        while True:
+            head = f.read(RECORD.size)
+            if len(head) < RECORD.size:
+                return
+            tag, timestamp, length = RECORD.unpack(head)
+            yield tag, timestamp, f.read(length)
+
+
+def read_landmarks(path):
+    """Yield (timestamp, landmarks or None) from a recording's landmark stream"""
+    for tag, timestamp, payload in read_records(path):
+        if tag == LANDMARKS:
+            yield timestamp, np.frombuffer(payload, dtype=np.float32).reshape(-1, 2) if payload else None
+
+
+class ReplayCapture:
+    """Drop-in stand-in for ``cv2.VideoCapture`` that plays a recording.
+
+    With ``realtime`` the frames are released on the recording's own
+    schedule; otherwise as fast as they are asked for.
+    """
+
+    def __init__(self, path, realtime=True, loop=False):
+        self.realtime = realtime
+        self.loop = loop
+        self.frames = [(timestamp, payload) for tag, timestamp, payload in read_records(path)
+                       if tag == FRAME]
+        self.position = 0
+        self.opened = bool(self.frames)
+        self.start = None
+        self.pending = None
+        self.timestamp = None  # recorded timestamp of the last grabbed frame
+
+        if self.opened:
+            first = cv2.imdecode(np.frombuffer(self.frames[0][1], np.uint8), cv2.IMREAD_COLOR)
+            self.height, self.width = first.shape[:2]
+            span = self.frames[-1][0] - self.frames[0][0]
+            self.fps = (len(self.frames) - 1) / span if span > 0 else 30.0
+
+    def isOpened(self):
+        return self.opened
+
+    def set(self, prop, value):
+        return False  # the recording's format is fixed
+
+    def get(self, prop):
+        if not self.opened:
+            return 0.0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.frames))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        return 0.0
+
+    def grab(self):
+        if not self.opened:
+            return False
+        if self.position >= len(self.frames):
+            if not self.loop:
+                self.opened = False
+                return False
+            self.position = 0
+            self.start = None
+
+        timestamp, payload = self.frames[self.position]
+        if self.realtime:
+            first = self.frames[0][0]
+            if self.start is None:
+                self.start = time.monotonic()
+            delay = self.start + (timestamp - first) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self.pending = payload
+        self.timestamp = timestamp
+        self.position += 1
+        return True
+
+    def retrieve(self, image=None):
+        if self.pending is None:
+            return False, None
+        frame = cv2.imdecode(np.frombuffer(self.pending, np.uint8), cv2.IMREAD_COLOR)
+        if image is not None and image.shape == frame.shape:
+            image[...] = frame
+            return True, image
+        return True, frame
+
+    def rewind(self):
+        """Play from the first frame again, on a fresh clock"""
+        self.position = 0
+        self.start = None
+        self.pending = None
+        self.opened = bool(self.frames)
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def release(self):
+        self.opened = False
+        self.frames = []
+
+
+def record(path, seconds, camera_index=0, landmarks=False):
+    """Record ``seconds`` of webcam frames (and optionally landmarks) to ``path``"""
+    tracker = None
+    if landmarks:
+        from hand_tracking import HandTracker
+        tracker = HandTracker(roi=False)
+
+    cap = cv2.VideoCapture(camera_index)
+    if not cap.isOpened():
+        raise SystemExit("Camera not available")
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    cap.set(cv2.CAP_PROP_FPS, 30)
+
+    end = time.monotonic() + seconds
+    with Recorder(path) as recorder:
+        while time.monotonic() < end:
+            if not cap.grab():
+                continue
+            timestamp = time.monotonic()
+            success, frame = cap.retrieve()
+            if not success:
+                continue
+            recorder.add_frame(frame, timestamp)
+            if tracker is not None:
+                hand = tracker.process(frame)
+                if hand is not None:
+                    hand[:, 0] = 1.0 - hand[:, 0]  # mirrored, as the game sees it
+                recorder.add_landmarks(hand, timestamp)
+        print(f"Recorded {recorder.frames} frames to {path}")
+    cap.release()
+    if tracker is not None:
+        tracker.close()
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else None
+
+
+def bench(path, roi_tracking=True):
+    """Run hand tracking and swipe recognition over a recording at full speed"""
+    from hand_tracking import HandTracker
+    from swipe import INDEX_FINGERTIP, SwipeRecognizer
+
+    capture = ReplayCapture(path, realtime=False)
+    tracker = HandTracker(roi=roi_tracking)
+    recognizer = SwipeRecognizer()
+    inference_ms = []
+    detection_ms = []
+    gestures = []
+
+    start = time.perf_counter()
+    while True:
+        grabbed = time.perf_counter()
+        success, frame = capture.read()
+        if not success:
+            break
+        landmarks = tracker.process(frame)
+        inference_ms.append(tracker.inference_ms)
+        if landmarks is not None:
+            landmarks[:, 0] = 1.0 - landmarks[:, 0]
+            x, y = landmarks[INDEX_FINGERTIP].tolist()
+            direction = recognizer.update(x, y, capture.timestamp)
+            if direction:
+                # Frame available to gesture decided, decode included
+                detection_ms.append((time.perf_counter() - grabbed) * 1000)
+                gestures.append((round(capture.timestamp - capture.frames[0][0], 3), direction))
+    elapsed = time.perf_counter() - start
+    tracker.close()
+
+    return {
+        'frames': len(inference_ms),
+        'fps': len(inference_ms) / elapsed if elapsed else None,
+        'inference_ms_mean': float(np.mean(inference_ms)) if inference_ms else None,
+        'inference_ms_p50': percentile(inference_ms, 50),
+        'inference_ms_p95': percentile(inference_ms, 95),
+        'roi_frames': tracker.roi_frames,
+        'tracking_lost': tracker.lost,
+        'detection_ms_p50': percentile(detection_ms, 50),
+        'detection_ms_p95': percentile(detection_ms, 95),
+        'gestures': gestures,
+    }
+
+
+def bench_landmarks(path):
+    """Run swipe recognition alone over a recording's stored landmarks; needs no MediaPipe"""
+    from swipe import INDEX_FINGERTIP, SwipeRecognizer
+
+    recognizer = SwipeRecognizer()
+    update_ms = []
+    gestures = []
+    first = None
+    for timestamp, landmarks in read_landmarks(path):
+        if first is None:
+            first = timestamp
+        if landmarks is None:
+            continue
+        start = time.perf_counter()
+        x, y = landmarks[INDEX_FINGERTIP].tolist()
+        direction = recognizer.update(x, y, timestamp)
+        update_ms.append((time.perf_counter() - start) * 1000)
+        if direction:
+            gestures.append((round(timestamp - first, 3), direction))
+
+    return {
+        'hand_frames': len(update_ms),
+        'update_ms_p50': percentile(update_ms, 50),
+        'update_ms_p99': percentile(update_ms, 99),
+        'gestures': gestures,
+    }
+
+
+def bench_pipeline(path, roi_tracking=True):
+    """Replay a recording in real time through GestureController and its worker.
+
+    The replay starts once the worker has loaded its model, so results do
+    not depend on how long that takes.  ``unprocessed_frames`` counts frames
+    the worker never picked up, neither run nor counted as dropped.
+    """
+    from app import GestureController
+
+    controller = GestureController(camera_index=path, roi_tracking=roi_tracking,
+                                   max_gesture_age=None)
+    if not controller.start(wait_ready=PIPELINE_MODEL_TIMEOUT):
+        raise SystemExit("Could not start the gesture pipeline")
+    latencies = []
+    gestures = []
+    try:
+        while controller.running and controller.camera_thread.is_alive():
+            for event in controller.drain_gestures():
+                latencies.append(controller.gesture_applied(event) * 1000)
+                gestures.append(event.direction)
+            time.sleep(0.001)
+        # Let the worker finish the last frames before the final read
+        time.sleep(0.2)
+        for event in controller.drain_gestures():
+            latencies.append(controller.gesture_applied(event) * 1000)
+            gestures.append(event.direction)
+        stats = controller.worker_stats()
+        replayed = controller.frames_captured
+    finally:
+        controller.stop()
+
+    processed = int(stats.get('frames', 0))
+    dropped = int(stats.get('dropped_frames', 0))
+    return {
+        'replayed_frames': replayed,
+        'frames': processed,
+        'inference_ms_avg': stats.get('inference_ms_avg'),
+        'dropped_frames': dropped,
+        'unprocessed_frames': replayed - processed - dropped,
+        'model_load_ms': stats.get('model_load_ms'),
+        'capture_to_gesture_ms_p50': percentile(latencies, 50),
+        'capture_to_gesture_ms_p95': percentile(latencies, 95),
+        'gestures': gestures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help="record from the webcam")
+    record_parser.add_argument('path')
+    record_parser.add_argument('--seconds', type=float, default=10)
+    record_parser.add_argument('--camera', type=int, default=0)
+    record_parser.add_argument('--landmarks', action='store_true',
+                               help="also store MediaPipe landmarks for each frame")
+
+    bench_parser = commands.add_parser('bench', help="benchmark the gesture path on a recording")
+    bench_parser.add_argument('path')
+    bench_parser.add_argument('--no-roi', action='store_true', help="always run full-frame detection")
+    mode = bench_parser.add_mutually_exclusive_group()
+    mode.add_argument('--pipeline', action='store_true',
+                      help="replay in real time through the capture thread and worker process")
+    mode.add_argument('--landmarks', action='store_true',
+                      help="replay stored landmarks through the swipe recognizer only")
+    bench_parser.add_argument('--json', action='store_true', help="print the report as JSON")
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(args.path, args.seconds, args.camera, args.landmarks)
+        return
+
+    if args.pipeline:
+        report = bench_pipeline(args.path, not args.no_roi)
+    elif args.landmarks:
+        report = bench_landmarks(args.path)
+    else:
+        report = bench(args.path, not args.no_roi)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for key, value in report.items():
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
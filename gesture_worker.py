@@ -0,0 +1,388 @@
+"""Hand inference in a separate process.
+
+The game process captures camera frames into a ``FrameRing`` in shared
+memory; the worker process reads them in place, runs MediaPipe and publishes
+swipes to a ``GestureChannel``, also in shared memory.  Inference therefore
+never competes with the pygame loop for the GIL, and frames are never pickled.
+
+Timestamps are ``time.monotonic()`` seconds taken when the frame was
+captured, so they can be compared across the two processes.
+"""
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from swipe import INDEX_FINGERTIP, SwipeRecognizer
+
+RING_SLOTS = 4
+CHANNEL_SLOTS = 8
+
+GESTURE_NAMES = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+GESTURE_CODES = {name: code for code, name in enumerate(GESTURE_NAMES)}
+
+GestureEvent = namedtuple('GestureEvent', ['seq', 'capture_time', 'direction'])
+
+
+class FrameRing:
+    """Fixed-size ring of frames in shared memory.
+
+    The header holds the sequence number of the newest frame and, per slot,
+    the sequence number and capture time of the frame stored there.  Readers
+    check the slot's sequence number again after using a frame to detect
+    that the writer lapped them mid-read.
+    """
+
+    HEADER = 1 + 2 * RING_SLOTS  # latest seq, then (seq, capture time) per slot
+
+    def __init__(self, shape, slots=RING_SLOTS, name=None):
+        if slots > RING_SLOTS:
+            raise ValueError(f"at most {RING_SLOTS} ring slots are supported")
+        self.shape = tuple(shape)
+        self.slots = slots
+        frame_bytes = int(np.prod(self.shape))
+        size = self.HEADER * 8 + slots * frame_bytes
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+
+        self.header = np.ndarray((self.HEADER,), dtype=np.float64, buffer=self.shm.buf)
+        self.frames = np.ndarray(
+            (slots,) + self.shape, dtype=np.uint8,
+            buffer=self.shm.buf, offset=self.HEADER * 8
+        )
+        if self.owner:
+            self.header[:] = -1
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def latest_seq(self):
+        return int(self.header[0])
+
+    def begin_write(self, seq):
+        """Claim the slot for frame ``seq``; returns it for the caller to fill"""
+        slot = seq % self.slots
+        self.header[1 + 2 * slot] = -1  # mark the slot as being written
+        return self.frames[slot]
+
+    def end_write(self, seq, capture_time):
+        """Publish the frame written since ``begin_write(seq)``"""
+        slot = seq % self.slots
+        self.header[2 + 2 * slot] = capture_time
+        self.header[1 + 2 * slot] = seq
+        self.header[0] = seq
+
+    def write(self, frame, capture_time, seq):
+        """Copy ``frame`` into the next slot and publish it as ``seq``"""
+        self.begin_write(seq)[...] = frame
+        self.end_write(seq, capture_time)
+
+    def read(self, seq):
+        """Return a zero-copy view of frame ``seq`` and its capture time, or None"""
+        slot = seq % self.slots
+        if int(self.header[1 + 2 * slot]) != seq:
+            return None
+        return self.frames[slot], self.header[2 + 2 * slot]
+
+    def still_valid(self, seq):
+        return int(self.header[1 + 2 * (seq % self.slots)]) == seq
+
+    def close(self):
+        # Drop the numpy views before closing the mapping
+        self.header = None
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class GestureChannel:
+    """Bounded, lock-free channel of timestamped gestures in shared memory.
+
+    A single writer publishes into a small ring; the reader remembers the
+    last sequence number it saw and drains everything newer.  Events the
+    reader was too slow to collect are overwritten rather than queued, and
+    counted in ``overruns``.
+    """
+
+    def __init__(self, slots=CHANNEL_SLOTS, name=None):
+        self.slots = slots
+        size = (1 + 3 * slots) * 8  # write seq, then (seq, capture time, code) per slot
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.data = np.ndarray((1 + 3 * slots,), dtype=np.float64, buffer=self.shm.buf)
+        if self.owner:
+            self.data[:] = -1
+        self.write_seq = int(self.data[0])
+        self.read_seq = int(self.data[0])
+        self.overruns = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, direction, capture_time):
+        """Writer side: append a gesture, overwriting the oldest one"""
+        seq = self.write_seq + 1
+        base = 1 + 3 * (seq % self.slots)
+        self.data[base] = -1  # mark the slot as being written
+        self.data[base + 1] = capture_time
+        self.data[base + 2] = GESTURE_CODES[direction]
+        self.data[base] = seq
+        self.data[0] = seq
+        self.write_seq = seq
+
+    def drain(self, max_age=None, now=None):
+        """Reader side: return new events, oldest first, skipping stale ones"""
+        head = int(self.data[0])
+        start = max(self.read_seq + 1, head - self.slots + 1)
+        self.overruns += start - (self.read_seq + 1)
+        self.read_seq = max(self.read_seq, head)
+        if now is None:
+            now = time.monotonic()
+
+        events = []
+        for seq in range(start, head + 1):
+            base = 1 + 3 * (seq % self.slots)
+            if int(self.data[base]) != seq:
+                self.overruns += 1
+                continue
+            capture_time = float(self.data[base + 1])
+            code = int(self.data[base + 2])
+            if int(self.data[base]) != seq:
+                self.overruns += 1  # overwritten while we read it
+                continue
+            if max_age is not None and now - capture_time > max_age:
+                continue
+            events.append(GestureEvent(seq, capture_time, GESTURE_NAMES[code]))
+        return events
+
+    def close(self):
+        self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedStats:
+    """Named float counters in shared memory, written by one process and read by another"""
+
+    def __init__(self, fields, name=None):
+        self.fields = {field: index for index, field in enumerate(fields)}
+        size = len(self.fields) * 8
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.data = np.ndarray((len(self.fields),), dtype=np.float64, buffer=self.shm.buf)
+        if self.owner:
+            self.data[:] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __getitem__(self, field):
+        return float(self.data[self.fields[field]])
+
+    def __setitem__(self, field, value):
+        self.data[self.fields[field]] = value
+
+    def snapshot(self):
+        return {field: float(self.data[index]) for field, index in self.fields.items()}
+
+    def close(self):
+        self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# Counters the inference worker publishes for the game process
+WORKER_STATS = (
+    'frames',           # frames run through inference
+    'inference_ms',     # inference time of the last frame
+    'inference_ms_avg', # exponential moving average of inference_ms
+    'roi_frames',       # frames served from the hand crop instead of the full frame
+    'tracking_lost',    # times the hand left the crop and full-frame detection took over
+    'dropped_frames',   # captured frames skipped because a newer one was ready
+    'frame_age_ms',     # capture to start of inference for the last frame
+    'ready',            # 1 once the hand model is loaded and frames are being read
+    'model_load_ms',    # worker start-up: MediaPipe import and model construction
+)
+
+
+class Preview:
+    """Debug camera window, rendered at a throttled rate off the inference path.
+
+    The inference loop only hands over a frame copy when a preview frame is
+    due; drawing the overlays, mirroring and showing the window all happen on
+    the preview's own thread.
+    """
+
+    WINDOW = "Snake Game - Gesture Control"
+
+    def __init__(self, fps=15):
+        self.interval = 1.0 / fps
+        self.next_time = 0.0
+        self.snapshot = None
+        self.ready = threading.Event()
+        self.closed = False
+
+    def due(self, now):
+        return not self.closed and now >= self.next_time
+
+    def post(self, frame, landmarks, gesture):
+        self.next_time = time.monotonic() + self.interval
+        self.snapshot = (frame, landmarks, gesture)
+        self.ready.set()
+
+    def run(self, stop_event):
+        import cv2
+        from hand_tracking import HAND_CONNECTIONS
+
+        while not stop_event.is_set() and not self.closed:
+            if not self.ready.wait(timeout=0.1):
+                continue
+            self.ready.clear()
+            frame, landmarks, gesture = self.snapshot
+
+            frame = cv2.flip(frame, 1)  # Mirror image; landmarks are already mirrored
+            h, w, _ = frame.shape
+
+            if landmarks is not None:
+                # Draw hand landmarks
+                points = [(int(x * w), int(y * h)) for x, y in landmarks]
+                for start, end in HAND_CONNECTIONS:
+                    cv2.line(frame, points[start], points[end], (255, 255, 255), 2)
+                for point in points:
+                    cv2.circle(frame, point, 3, (0, 0, 255), -1)
+
+                # Draw fingertip position
+                cv2.circle(frame, points[INDEX_FINGERTIP], 8, (0, 255, 0), -1)
+
+            # Add UI elements
+            cv2.putText(frame, "Snake Game Gesture Control", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            cv2.putText(frame, "Swipe with index finger", (10, 60),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            cv2.putText(frame, "Press ESC to close camera", (10, h-20),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+            # Show gesture feedback
+            if gesture:
+                cv2.putText(frame, f"Gesture: {gesture}", (10, 90),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+
+            cv2.imshow(self.WINDOW, frame)
+
+            # Check for ESC key to close camera window
+            if cv2.waitKey(1) & 0xFF == 27:
+                self.closed = True
+
+        cv2.destroyAllWindows()
+
+
+def run_worker(ring_name, shape, slots, channel_name, stats_name, frame_ready, stop_event,
+               roi_tracking=True, preview_fps=0):
+    """Entry point of the inference process.
+
+    With ``preview_fps`` set, inference moves to a background thread and the
+    preview window runs on the main thread, as GUI toolkits require.
+    """
+    if not preview_fps:
+        _inference_loop(ring_name, shape, slots, channel_name, stats_name, frame_ready,
+                        stop_event, roi_tracking, None)
+        return
+
+    preview = Preview(preview_fps)
+    inference = threading.Thread(
+        target=_inference_loop,
+        args=(ring_name, shape, slots, channel_name, stats_name, frame_ready,
+              stop_event, roi_tracking, preview),
+        daemon=True
+    )
+    inference.start()
+    preview.run(stop_event)
+    inference.join()
+
+
+def _inference_loop(ring_name, shape, slots, channel_name, stats_name, frame_ready, stop_event,
+                    roi_tracking, preview):
+    load_start = time.perf_counter()
+    from hand_tracking import HandTracker
+
+    ring = FrameRing(shape, slots, name=ring_name)
+    channel = GestureChannel(name=channel_name)
+    stats = SharedStats(WORKER_STATS, name=stats_name)
+    tracker = HandTracker(roi=roi_tracking)
+    recognizer = SwipeRecognizer()
+    stats['model_load_ms'] = (time.perf_counter() - load_start) * 1000
+    stats['ready'] = 1
+    last_seq = -1
+    last_gesture = None
+
+    try:
+        while not stop_event.is_set():
+            if not frame_ready.wait(timeout=0.1):
+                continue
+            frame_ready.clear()
+
+            seq = ring.latest_seq()
+            if seq <= last_seq:
+                continue
+            entry = ring.read(seq)
+            if entry is None:
+                continue
+            if last_seq >= 0:
+                stats['dropped_frames'] += seq - last_seq - 1
+            last_seq = seq
+            frame, capture_time = entry
+            stats['frame_age_ms'] = (time.monotonic() - capture_time) * 1000
+
+            # Inference runs on the unmirrored frame straight from the ring;
+            # only the landmark x coordinates get mirrored afterwards
+            landmarks = tracker.process(frame)
+            if not ring.still_valid(seq):
+                continue  # the capture side overwrote the slot mid-read
+
+            stats['frames'] = tracker.frames
+            stats['inference_ms'] = tracker.inference_ms
+            stats['inference_ms_avg'] += 0.1 * (tracker.inference_ms - stats['inference_ms_avg'])
+            stats['roi_frames'] = tracker.roi_frames
+            stats['tracking_lost'] = tracker.lost
+
+            if landmarks is not None:
+                landmarks[:, 0] = 1.0 - landmarks[:, 0]
+
+                # Index fingertip position, normalized to the frame
+                x, y = landmarks[INDEX_FINGERTIP].tolist()
+                direction = recognizer.update(x, y, capture_time)
+                if direction:
+                    channel.publish(direction, capture_time)
+                    last_gesture = direction
+
+            if preview is not None and preview.due(time.monotonic()):
+                snapshot = frame.copy()
+                if ring.still_valid(seq):
+                    preview.post(snapshot, landmarks, last_gesture)
+    except Exception as e:
+        print(f"Error in inference worker: {e}")
+    finally:
+        tracker.close()
+        stats.close()
+        channel.close()
+        ring.close()
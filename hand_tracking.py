@@ -0,0 +1,121 @@
+"""Fingertip tracking with region-of-interest inference.
+
+Once a hand has been found, following frames only run MediaPipe on a padded
+crop around the previous hand, downscaled to ``roi_size``.  When the hand is
+not found in the crop, tracking is lost and the frame is retried with
+full-frame detection.  Used by the inference worker process.
+"""
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from swipe import INDEX_FINGERTIP  # noqa: F401  (re-exported)
+
+HAND_CONNECTIONS = tuple(mp.solutions.hands.HAND_CONNECTIONS)
+
+
+class HandTracker:
+    def __init__(self, roi=True, roi_size=192, padding=0.5,
+                 min_detection_confidence=0.7, min_tracking_confidence=0.5):
+        self.roi = roi
+        self.roi_size = roi_size
+        self.padding = padding  # extra margin around the hand, relative to its size
+
+        hands = mp.solutions.hands
+        self.full_hands = hands.Hands(
+            max_num_hands=1,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        # Separate graph for crops so its tracking state only ever sees crops
+        self.roi_hands = hands.Hands(
+            max_num_hands=1,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        ) if roi else None
+
+        self.box = None  # last hand bounding box in pixels (x0, y0, x1, y1)
+        self.inference_ms = 0.0
+        self.used_roi = False
+        self.frames = 0
+        self.roi_frames = 0
+        self.lost = 0
+
+    def close(self):
+        self.full_hands.close()
+        if self.roi_hands:
+            self.roi_hands.close()
+
+    def process(self, frame):
+        """Find the hand in a BGR frame.
+
+        Returns a (21, 2) array of landmark positions normalized to the full
+        frame, or None when no hand is visible.
+        """
+        start = time.perf_counter()
+        h, w = frame.shape[:2]
+        landmarks = None
+        self.used_roi = False
+
+        if self.roi_hands is not None and self.box is not None:
+            landmarks = self._process_roi(frame, w, h)
+            if landmarks is None:
+                # Tracking lost: fall back to full-frame detection
+                self.box = None
+                self.lost += 1
+            else:
+                self.used_roi = True
+                self.roi_frames += 1
+
+        if landmarks is None:
+            result = self.full_hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            landmarks = _first_hand(result)
+
+        if landmarks is not None:
+            self.box = self._bounding_box(landmarks, w, h)
+
+        self.frames += 1
+        self.inference_ms = (time.perf_counter() - start) * 1000
+        return landmarks
+
+    def _process_roi(self, frame, w, h):
+        x0, y0, x1, y1 = self.box
+        crop = frame[y0:y1, x0:x1]
+        crop_h, crop_w = crop.shape[:2]
+        scale = self.roi_size / max(crop_w, crop_h)
+        if scale < 1:
+            crop = cv2.resize(crop, (max(1, int(crop_w * scale)), max(1, int(crop_h * scale))),
+                              interpolation=cv2.INTER_AREA)
+
+        landmarks = _first_hand(self.roi_hands.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)))
+        if landmarks is None:
+            return None
+        # Crop-normalized to full-frame-normalized coordinates
+        landmarks[:, 0] = (x0 + landmarks[:, 0] * crop_w) / w
+        landmarks[:, 1] = (y0 + landmarks[:, 1] * crop_h) / h
+        return landmarks
+
+    def _bounding_box(self, landmarks, w, h):
+        """Padded square box around the landmarks, clipped to the frame"""
+        xs = landmarks[:, 0] * w
+        ys = landmarks[:, 1] * h
+        cx = (xs.min() + xs.max()) / 2
+        cy = (ys.min() + ys.max()) / 2
+        side = max(xs.max() - xs.min(), ys.max() - ys.min()) * (1 + 2 * self.padding)
+        half = max(side, 32) / 2
+        x0 = int(max(0, cx - half))
+        y0 = int(max(0, cy - half))
+        x1 = int(min(w, cx + half))
+        y1 = int(min(h, cy + half))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        return x0, y0, x1, y1
+
+
+def _first_hand(result):
+    if not result.multi_hand_landmarks:
+        return None
+    hand = result.multi_hand_landmarks[0]
+    return np.array([(lm.x, lm.y) for lm in hand.landmark], dtype=np.float64)
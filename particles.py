@@ -0,0 +1,109 @@
+"""Vectorized particle system.
+
+Particles live in preallocated NumPy arrays (structure of arrays) instead of
+one Python object each.  Live particles are kept packed at the front of the
+arrays, so ``update()`` integrates and culls all of them in a single
+vectorized pass and new particles simply reuse the slots past the end.
+"""
+import numpy as np
+import pygame
+
+DEFAULT_CAPACITY = 4096
+DAMPING = 0.98  # velocity multiplier per frame
+
+
+class ParticleSystem:
+    def __init__(self, capacity=DEFAULT_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, colors, speed, life, count=1, jitter=0):
+        """Spawn up to ``count`` particles around (x, y).
+
+        Positions are offset uniformly by up to ``jitter`` (a number or an
+        (x, y) pair), velocities are uniform in +/- ``speed`` and each particle
+        picks a color from ``colors``.  Particles past the capacity are dropped.
+        """
+        start = self.count
+        count = min(count, self.capacity - start)
+        if count <= 0:
+            return 0
+        end = start + count
+        rng = self.rng
+
+        jitter = np.broadcast_to(np.asarray(jitter, dtype=np.float32), (2,))
+        self.pos[start:end] = (x, y)
+        self.pos[start:end] += rng.uniform(-1, 1, (count, 2)) * jitter
+        self.vel[start:end] = rng.uniform(-speed, speed, (count, 2))
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        self.size[start:end] = rng.integers(2, 6, count)
+
+        palette = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+        if len(palette) == 1:
+            self.color[start:end] = palette[0]
+        else:
+            self.color[start:end] = palette[rng.integers(0, len(palette), count)]
+
+        self.count = end
+        return count
+
+    def update(self):
+        """Advance every live particle one frame and drop the dead ones"""
+        n = self.count
+        if n == 0:
+            return
+        pos = self.pos[:n]
+        vel = self.vel[:n]
+        life = self.life[:n]
+        pos += vel
+        vel *= DAMPING
+        life -= 1
+
+        alive = life > 0
+        live = int(np.count_nonzero(alive))
+        if live < n:
+            # Compact the survivors to the front so the freed slots get reused
+            for array in (self.pos, self.vel, self.life, self.max_life, self.size, self.color):
+                array[:live] = array[:n][alive]
+        self.count = live
+
+    def shift(self, dx, dy):
+        """Move every live particle by (dx, dy), e.g. to keep them in place as the view scrolls"""
+        self.pos[:self.count] += (dx, dy)
+
+    def draw(self, screen):
+        """Draw the live particles that fall on ``screen``; returns the rects touched"""
+        n = self.count
+        if n == 0:
+            return []
+        fade = self.life[:n] / self.max_life[:n]
+        sizes = np.maximum(1, (self.size[:n] * fade).astype(np.int32))
+        positions = self.pos[:n].astype(np.int32)
+        colors = self.color[:n]
+
+        width, height = screen.get_size()
+        x, y = positions[:, 0], positions[:, 1]
+        visible = (x > -sizes) & (x < width + sizes) & (y > -sizes) & (y < height + sizes)
+        if not visible.all():
+            sizes, positions, colors = sizes[visible], positions[visible], colors[visible]
+
+        draw_circle = pygame.draw.circle
+        return [
+            draw_circle(screen, color, center, size)
+            for color, center, size in zip(colors.tolist(), positions.tolist(), sizes.tolist())
+        ]
@@ -0,0 +1,194 @@
+"""Per-frame timing for the game loop.
+
+The loop calls ``begin_frame()`` once per frame and ``lap(name)`` after each
+section, which charges the time since the previous lap to that named span.
+Other per-frame values (gesture capture, inference and queue times) go in
+through ``record()``.  The last ``capacity`` frames are kept in a NumPy ring
+and are only written out when ``save()`` is called, so profiling costs a few
+array stores per frame.  While disabled every call returns immediately.
+"""
+import csv
+import json
+import math
+import time
+
+import numpy as np
+import pygame
+
+DEFAULT_CAPACITY = 600  # frames kept, 10 seconds at 60 FPS
+MAX_COLUMNS = 32
+
+
+class FrameProfiler:
+    def __init__(self, capacity=DEFAULT_CAPACITY, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.columns = {}  # span or metric name -> column index
+        self.frame_ms = np.zeros(capacity)
+        self.values = np.full((capacity, MAX_COLUMNS), np.nan)
+        self.frames = 0  # frames completed since the last reset
+        self.row = np.full(MAX_COLUMNS, np.nan)
+        self.frame_start = None
+        self.last = None
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.frame_start = None  # the frame in progress is not timed
+
+    def reset(self):
+        self.frames = 0
+        self.frame_start = None
+
+    def begin_frame(self):
+        """Close the previous frame, if one was open, and start timing a new one"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            slot = self.frames % self.capacity
+            self.frame_ms[slot] = (now - self.frame_start) * 1000
+            self.values[slot] = self.row
+            self.frames += 1
+        self.row.fill(np.nan)
+        self.frame_start = self.last = now
+
+    def lap(self, name):
+        """Charge the time since the previous lap to span ``name``"""
+        if not self.enabled or self.frame_start is None:
+            return
+        now = time.perf_counter()
+        column = self._column(name)
+        elapsed = (now - self.last) * 1000
+        previous = self.row[column]
+        self.row[column] = elapsed if math.isnan(previous) else previous + elapsed
+        self.last = now
+
+    def record(self, name, value):
+        """Store a per-frame value, e.g. a gesture timing in milliseconds"""
+        if not self.enabled or self.frame_start is None or value is None:
+            return
+        self.row[self._column(name)] = value
+
+    def _column(self, name):
+        column = self.columns.get(name)
+        if column is None:
+            if len(self.columns) == MAX_COLUMNS:
+                raise ValueError(f"profiler has no room for more than {MAX_COLUMNS} columns")
+            column = self.columns[name] = len(self.columns)
+        return column
+
+    def _order(self):
+        """Ring slots of the recorded frames, oldest first"""
+        count = min(self.frames, self.capacity)
+        start = self.frames - count
+        return np.arange(start, self.frames) % self.capacity, start
+
+    def recent_frame_ms(self, count):
+        """Frame times of the last ``count`` frames, oldest first"""
+        count = min(count, self.frames, self.capacity)
+        slots = np.arange(self.frames - count, self.frames) % self.capacity
+        return self.frame_ms[slots]
+
+    def summary(self):
+        """Frame time percentiles and mean span times over the recorded frames"""
+        slots, _ = self._order()
+        if len(slots) == 0:
+            return None
+        frame_ms = self.frame_ms[slots]
+        values = self.values[slots]
+        spans = {}
+        for name, column in self.columns.items():
+            column_values = values[:, column]
+            present = column_values[~np.isnan(column_values)]
+            if len(present):
+                spans[name] = float(present.mean())
+        return {
+            'frames': len(slots),
+            'p50': float(np.percentile(frame_ms, 50)),
+            'p99': float(np.percentile(frame_ms, 99)),
+            'max': float(frame_ms.max()),
+            'spans': spans,
+        }
+
+    def save(self, path):
+        """Write the recorded frames as CSV, or as JSON lines if ``path`` ends in .jsonl"""
+        slots, start = self._order()
+        names = list(self.columns)
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.jsonl'):
+                for frame, slot in enumerate(slots, start):
+                    record = {'frame': frame, 'frame_ms': round(float(self.frame_ms[slot]), 4)}
+                    for name in names:
+                        value = self.values[slot, self.columns[name]]
+                        if not math.isnan(value):
+                            record[name] = round(float(value), 4)
+                    f.write(json.dumps(record) + '\n')
+            else:
+                writer = csv.writer(f)
+                writer.writerow(['frame', 'frame_ms'] + names)
+                for frame, slot in enumerate(slots, start):
+                    row = [frame, f'{self.frame_ms[slot]:.4f}']
+                    for name in names:
+                        value = self.values[slot, self.columns[name]]
+                        row.append('' if math.isnan(value) else f'{value:.4f}')
+                    writer.writerow(row)
+        return len(slots)
+
+
+class ProfilerOverlay:
+    """Frame time graph with p50/p99 and the slowest spans, drawn in a corner.
+
+    The text is only re-rendered every ``refresh`` frames; the graph is
+    redrawn every frame.
+    """
+
+    GRAPH_FRAMES = 120
+    BUDGET_MS = 1000 / 60
+
+    def __init__(self, profiler, font, refresh=30, width=260, height=70, max_spans=6):
+        self.profiler = profiler
+        self.font = font
+        self.refresh = refresh
+        self.width = width
+        self.height = height
+        self.max_spans = max_spans
+        self.lines = []
+        self.age = refresh
+
+    def draw(self, screen, x, y):
+        """Draw at (x, y); returns the rect touched"""
+        if self.age >= self.refresh:
+            self.lines = self._render_lines()
+            self.age = 0
+        self.age += 1
+
+        line_height = self.font.get_linesize()
+        panel = pygame.Rect(x, y, self.width, self.height + 8 + line_height * len(self.lines))
+        pygame.draw.rect(screen, (0, 0, 0), panel)
+
+        # Frame times, scaled so twice the 60 FPS budget fills the graph
+        graph = pygame.Rect(x + 4, y + 4, self.width - 8, self.height)
+        scale = graph.height / (2 * self.BUDGET_MS)
+        budget_y = graph.bottom - int(self.BUDGET_MS * scale)
+        pygame.draw.line(screen, (90, 90, 40), (graph.left, budget_y), (graph.right, budget_y))
+        frame_ms = self.profiler.recent_frame_ms(self.GRAPH_FRAMES)
+        if len(frame_ms) > 1:
+            step = graph.width / (self.GRAPH_FRAMES - 1)
+            heights = np.minimum(frame_ms * scale, graph.height).astype(np.int32)
+            points = [(graph.left + int(i * step), graph.bottom - h) for i, h in enumerate(heights.tolist())]
+            pygame.draw.lines(screen, (102, 255, 178), False, points)
+
+        text_y = graph.bottom + 4
+        for surface in self.lines:
+            screen.blit(surface, (x + 4, text_y))
+            text_y += line_height
+        return panel
+
+    def _render_lines(self):
+        summary = self.profiler.summary()
+        if summary is None:
+            return [self.font.render('profiling...', True, (220, 220, 220))]
+        lines = [f"frame p50 {summary['p50']:.1f} ms  p99 {summary['p99']:.1f} ms  max {summary['max']:.1f}"]
+        slowest = sorted(summary['spans'].items(), key=lambda item: -item[1])[:self.max_spans]
+        lines += [f"{name:<18} {ms:6.2f} ms" for name, ms in slowest]
+        return [self.font.render(line, True, (220, 220, 220)) for line in lines]
@@ -0,0 +1,109 @@
+"""Visual quality tiers and the governor that picks one to hold the frame budget.
+
+A tier scales the particle spawn rates and chooses how much detail goes into
+the pre-rendered food glow and snake segments.  ``QualityGovernor`` steps
+down a tier when frames keep running over budget and back up when the work
+per frame stays well under it; separate thresholds, hold counts and a
+cooldown after each change keep it from oscillating between two tiers, and
+each time a tier proves too slow the governor waits twice as long before
+trying it again.
+"""
+from collections import namedtuple
+
+FRAME_BUDGET_MS = 1000 / 60
+
+QualityTier = namedtuple('QualityTier', [
+    'name',
+    'particles',       # multiplier on particle spawn rates and counts
+    'glow_ring_step',  # radius step between food glow rings, 0 for no glow
+    'segment_detail',  # shadow and highlight passes on snake segments
+])
+
+# Best first; the governor moves along this tuple
+QUALITY_TIERS = (
+    QualityTier('high', 1.0, 2, True),
+    QualityTier('medium', 0.5, 4, True),
+    QualityTier('low', 0.15, 0, False),
+)
+QUALITY_NAMES = tuple(tier.name for tier in QUALITY_TIERS)
+
+
+class QualityGovernor:
+    def __init__(self, tier='high', auto=True, budget_ms=FRAME_BUDGET_MS,
+                 slow_frames=20, fast_frames=180, cooldown=60, smoothing=0.1):
+        self.index = QUALITY_NAMES.index(tier)
+        self.auto = auto
+        self.budget_ms = budget_ms
+        self.slow_limit = budget_ms * 1.15  # frame time that counts as over budget
+        self.fast_limit = budget_ms * 0.5   # work time that leaves room to step up
+        self.slow_frames = slow_frames      # consecutive slow frames before stepping down
+        self.fast_frames = fast_frames      # consecutive fast frames before stepping up
+        self.cooldown = cooldown            # frames ignored after a change
+        self.smoothing = smoothing
+        # Fast frames needed to step up into each tier; doubles each time it proves too slow
+        self.fast_needed = [fast_frames] * len(QUALITY_TIERS)
+        self.reset()
+
+    @property
+    def tier(self):
+        return QUALITY_TIERS[self.index]
+
+    @property
+    def mode(self):
+        return 'auto' if self.auto else self.tier.name
+
+    def reset(self):
+        """Forget the frame history, e.g. after a pause in rendering"""
+        self.frame_avg = None
+        self.work_avg = None
+        self.slow = 0
+        self.fast = 0
+        self.hold = self.cooldown
+
+    def cycle(self):
+        """Keyboard toggle: auto, then each fixed tier from best to worst, then auto"""
+        if self.auto:
+            self.auto = False
+            self.index = 0
+        elif self.index < len(QUALITY_TIERS) - 1:
+            self.index += 1
+        else:
+            self.auto = True
+            self.index = 0
+        self.reset()
+        return self.mode
+
+    def update(self, frame_ms, work_ms):
+        """Feed one frame's timings; returns True when the tier changed.
+
+        ``frame_ms`` is the full frame time (``clock.get_time()``) and
+        ``work_ms`` the part spent before the frame cap's sleep
+        (``clock.get_rawtime()``).  Capped frames always take about the
+        budget, so only ``work_ms`` shows how much headroom there is.
+        """
+        if not self.auto:
+            return False
+        if self.frame_avg is None:
+            self.frame_avg = frame_ms
+            self.work_avg = work_ms
+        else:
+            self.frame_avg += self.smoothing * (frame_ms - self.frame_avg)
+            self.work_avg += self.smoothing * (work_ms - self.work_avg)
+
+        if self.hold:
+            self.hold -= 1
+            return False
+
+        self.slow = self.slow + 1 if self.frame_avg > self.slow_limit else 0
+        self.fast = self.fast + 1 if self.work_avg < self.fast_limit else 0
+
+        if self.slow >= self.slow_frames and self.index < len(QUALITY_TIERS) - 1:
+            self.fast_needed[self.index] = min(self.fast_needed[self.index] * 2, 60 * self.fast_frames)
+            self.index += 1
+        elif self.index > 0 and self.fast >= self.fast_needed[self.index - 1]:
+            self.index -= 1
+        else:
+            return False
+        # Timings from the old tier say nothing about the new one
+        self.reset()
+        return True
@@ -0,0 +1,137 @@
+"""Caches for rendering work that does not change from frame to frame."""
+from collections import OrderedDict
+
+import pygame
+
+
+class StaticLayer:
+    """A surface painted once by ``painter`` and reused until invalidated.
+
+    The layer is repainted when the target size changes or after
+    ``invalidate()``.  Layers that depend on a few values (a final score,
+    say) take them as ``key``: the painter is called as
+    ``painter(surface, *key)`` and runs again only when the key changes.
+    Transparent layers only blit the bounding box of what
+    was actually painted, so sparse overlays such as titles stay cheap.
+    """
+
+    def __init__(self, painter, transparent=False):
+        self.painter = painter
+        self.transparent = transparent
+        self.surface = None
+        self.area = None
+        self.key = None
+
+    def invalidate(self):
+        self.surface = None
+
+    def render(self, size, key=None):
+        if self.transparent:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+        else:
+            surface = pygame.Surface(size)
+        if key is None:
+            self.painter(surface)
+        else:
+            self.painter(surface, *key)
+        self.key = key
+
+        # Match the display format so blits skip pixel conversion
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if self.transparent else surface.convert()
+
+        self.surface = surface
+        self.area = surface.get_bounding_rect() if self.transparent else surface.get_rect()
+
+    def blit(self, screen, rect=None, key=None):
+        """Blit the layer, or only the part of it under ``rect``"""
+        if self.surface is None or self.surface.get_size() != screen.get_size() or key != self.key:
+            self.render(screen.get_size(), key)
+        area = self.area if rect is None else self.area.clip(rect)
+        return screen.blit(self.surface, area.topleft, area)
+
+
+class SpriteCache:
+    """Transparent sprites baked once per key and blitted as-is afterwards.
+
+    Callers quantize animated parameters (gradient steps, pulse phases) into
+    the key so the number of baked sprites stays bounded.
+    """
+
+    def __init__(self):
+        self.sprites = {}
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def get(self, key, size, painter):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface(size, pygame.SRCALPHA)
+            painter(sprite)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self.sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces.
+
+    Keyed on (font, text, color, antialias), so a string such as the score is
+    only re-rendered when its text actually changes.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class StaticLayers:
+    """Registry of named static layers sharing one invalidation point"""
+
+    def __init__(self):
+        self.layers = {}
+
+    def register(self, name, painter, transparent=False):
+        self.layers[name] = StaticLayer(painter, transparent)
+        return self.layers[name]
+
+    def blit(self, name, screen, rect=None, key=None):
+        return self.layers[name].blit(screen, rect, key)
+
+    def invalidate(self, name=None):
+        """Drop one cached layer, or all of them (e.g. on a theme change)"""
+        if name is not None:
+            self.layers[name].invalidate()
+            return
+        for layer in self.layers.values():
+            layer.invalidate()
@@ -0,0 +1,145 @@
+"""Swipe recognition from a stream of fingertip positions.
+
+Positions are normalized to the camera frame (0..1) and timestamped, so the
+thresholds are in frame-widths per second and do not depend on the camera's
+resolution or frame rate.  Each coordinate is smoothed with a One-Euro
+filter, which removes jitter when the hand is still but adds almost no lag
+once it moves fast, and a swipe fires as soon as the velocity over the last
+``window_frames`` sample intervals crosses ``velocity_threshold``.  The
+window follows the observed sample rate, so a clean swipe commits one or
+two frames after it starts at 15, 30 or 60 fps alike.  The recognizer re-arms once the
+hand slows below ``release_threshold`` instead of waiting out a cooldown.
+"""
+import math
+from collections import deque
+
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+INDEX_FINGERTIP = 8  # MediaPipe hand landmark the swipes follow
+
+
+class OneEuroFilter:
+    """One-Euro low-pass filter (Casiez et al., CHI 2012) for a single value"""
+
+    def __init__(self, min_cutoff=1.0, beta=5.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.derivative = 0.0
+        self.last_time = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, value, t):
+        if self.value is None or t <= self.last_time:
+            self.value = value
+            self.last_time = t
+            return value
+
+        dt = t - self.last_time
+        self.last_time = t
+
+        derivative = (value - self.value) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.derivative += a_d * (derivative - self.derivative)
+
+        cutoff = self.min_cutoff + self.beta * abs(self.derivative)
+        self.value += self._alpha(cutoff, dt) * (value - self.value)
+        return self.value
+
+
+class SwipeRecognizer:
+    def __init__(self, velocity_threshold=1.0, release_threshold=0.4, window_frames=1.5,
+                 history=16, dominance=1.5, max_gap=0.25, return_block=0.3,
+                 min_cutoff=1.0, beta=20.0):
+        self.velocity_threshold = velocity_threshold  # frame widths per second
+        self.release_threshold = release_threshold
+        self.window_frames = window_frames  # sample intervals the velocity is measured over
+        self.interval = None        # smoothed time between samples, in seconds
+        self.dominance = dominance  # main axis must be this much faster than the other
+        self.max_gap = max_gap      # longer gaps in tracking start a fresh stroke
+        # Ignore the hand travelling back for this long after a swipe
+        self.return_block = return_block
+
+        self.filter_x = OneEuroFilter(min_cutoff, beta)
+        self.filter_y = OneEuroFilter(min_cutoff, beta)
+        self.history = deque(maxlen=history)  # (t, x, y) after filtering
+        self.armed = True
+        self.velocity = (0.0, 0.0)
+        self.last_swipe = None  # (direction, time)
+
+    def reset(self):
+        self.filter_x.reset()
+        self.filter_y.reset()
+        self.history.clear()
+        self.armed = True
+        self.velocity = (0.0, 0.0)
+
+    @property
+    def window(self):
+        """Seconds of history the velocity is measured over"""
+        return self.window_frames * self.interval if self.interval else 0.0
+
+    def update(self, x, y, t):
+        """Feed a normalized fingertip position at time ``t`` (seconds).
+
+        Returns 'UP', 'DOWN', 'LEFT', 'RIGHT' or None.
+        """
+        if self.history and t - self.history[-1][0] > self.max_gap:
+            self.reset()
+
+        if self.history and t > self.history[-1][0]:
+            # Learn the sample rate; the window spans a fixed number of samples
+            dt = t - self.history[-1][0]
+            self.interval = dt if self.interval is None else self.interval + 0.2 * (dt - self.interval)
+
+        x = self.filter_x(x, t)
+        y = self.filter_y(y, t)
+        self.history.append((t, x, y))
+
+        # Velocity against the oldest sample still inside the window, but
+        # always at least the previous sample so one frame of motion counts
+        history = self.history
+        if len(history) < 2:
+            return None
+        oldest = history[-2]
+        for sample in reversed(history):
+            if t - sample[0] > self.window:
+                break
+            if sample[0] < t:
+                oldest = sample
+        dt = t - oldest[0]
+        if dt <= 0:
+            return None
+        vx = (x - oldest[1]) / dt
+        vy = (y - oldest[2]) / dt
+        self.velocity = (vx, vy)
+
+        speed = max(abs(vx), abs(vy))
+        if not self.armed:
+            if speed < self.release_threshold:
+                self.armed = True
+            return None
+        if speed < self.velocity_threshold:
+            return None
+
+        if abs(vx) > self.dominance * abs(vy):
+            direction = 'RIGHT' if vx > 0 else 'LEFT'
+        elif abs(vy) > self.dominance * abs(vx):
+            direction = 'UP' if vy < 0 else 'DOWN'
+        else:
+            return None  # diagonal: wait for the stroke to pick an axis
+
+        if self.last_swipe is not None:
+            last_direction, last_time = self.last_swipe
+            if direction == OPPOSITE[last_direction] and t - last_time < self.return_block:
+                return None
+        self.armed = False
+        self.last_swipe = (direction, t)
+        return direction
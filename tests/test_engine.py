@@ -0,0 +1,101 @@
+from autopilot import play
+from engine import DOWN, LEFT, RIGHT, TURN_BUFFER, UP, Game, Snake
+
+
+def grown_snake(grid_width, grid_height, moves):
+    """Snake that has grown on each of ``moves`` moves to the right"""
+    snake = Snake(grid_width, grid_height)
+    for _ in range(moves):
+        snake.grow = True
+        assert snake.move()
+    return snake
+
+
+def test_head_may_enter_the_cell_the_tail_leaves():
+    # Fills a 3 x 1 board, so the only cell ahead is the tail's
+    snake = grown_snake(3, 1, 2)
+    tail = snake.body[-1]
+    assert snake.move()
+    assert snake.head == tail
+    assert len(snake) == 3
+
+
+def test_head_may_not_enter_the_tail_while_growing():
+    snake = grown_snake(3, 1, 2)
+    snake.grow = True
+    assert not snake.move()
+
+
+def test_occupancy_and_free_cells_follow_the_body():
+    snake = grown_snake(5, 4, 3)
+    for _ in range(7):
+        assert snake.move()
+        covered = {y * 5 + x for x, y in snake.body}
+        assert {i for i in range(20) if snake.occupied[i]} == covered
+        assert set(snake.free.cells) == set(range(20)) - covered
+        for index in covered:
+            assert snake.body[snake.segment_at(index)] == (index % 5, index // 5)
+
+
+def test_reversal_is_rejected():
+    snake = Snake(10, 10)
+    assert snake.direction == RIGHT
+    snake.set_direction(LEFT)
+    assert snake.direction == RIGHT
+    snake.set_direction(UP)
+    assert snake.direction == UP
+
+
+def test_queued_turns_apply_in_order():
+    game = Game(10, 10, seed=0)
+    assert game.queue_turn(UP)
+    assert game.queue_turn(LEFT)
+    game.step()
+    assert game.snake.direction == UP
+    game.step()
+    assert game.snake.direction == LEFT
+
+
+def test_queue_turn_rejects_reversals_repeats_and_overflow():
+    game = Game(10, 10, seed=0)
+    assert not game.queue_turn(LEFT)   # reverses RIGHT
+    assert not game.queue_turn(RIGHT)  # already the direction
+    assert game.queue_turn(DOWN)
+    assert not game.queue_turn(UP)     # reverses the queued DOWN
+    assert game.queue_turn(LEFT)
+    assert len(game.turns) == TURN_BUFFER
+    assert not game.queue_turn(UP)
+
+
+def test_food_spawns_on_free_cells_only():
+    game = Game(6, 5, seed=3)
+    for _ in range(500):
+        if not game.alive:
+            game.reset()
+        assert game.food_pos is not None
+        assert not game.snake.occupies(game.food_pos)
+        head = game.snake.head
+        food = game.food_pos
+        # Step towards the food, vertically first, so the snake eats and grows
+        if head[1] != food[1]:
+            game.step(DOWN if (food[1] - head[1]) % 5 < 3 else UP)
+        else:
+            game.step(RIGHT if (food[0] - head[0]) % 6 < 4 else LEFT)
+
+
+def test_filling_the_board_wins():
+    # Moving right along a 3 x 1 board eats each food in turn; the third
+    # lands on the last free cell, and eating it leaves none
+    game = Game(3, 1, seed=0)
+    while game.alive:
+        game.step()
+    assert game.outcome == 'won'
+    assert len(game.snake) == 3
+    assert game.food_pos is None
+    assert game.score == 30
+
+
+def test_autopilot_fills_a_small_board():
+    game, _ = play(4, 3, seed=0)
+    assert game.outcome == 'won'
+    assert len(game.snake) == 12
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from swipe import SwipeRecognizer
+
+ONSET = 0.5  # seconds of still hand before a swipe starts
+
+
+def swipe(fps, dx, dy, speed=2.0, noise=0.002, seed=0):
+    """(frames after the onset, direction) for each swipe a simulated stroke fires"""
+    rng = random.Random(seed)
+    recognizer = SwipeRecognizer()
+    fired = []
+    for frame in range(int((ONSET + 0.3) * fps)):
+        t = frame / fps
+        moved = speed * max(0.0, t - ONSET)
+        x = 0.3 + dx * moved + rng.gauss(0, noise)
+        y = 0.7 + dy * moved + rng.gauss(0, noise)
+        direction = recognizer.update(x, y, t)
+        if direction:
+            fired.append((round((t - ONSET) * fps), direction))
+    return fired
+
+
+def still_hand(fps, noise, seconds=60, seed=1):
+    """Swipes fired by a hand held still, its landmark jittering by ``noise``"""
+    rng = random.Random(seed)
+    recognizer = SwipeRecognizer()
+    return sum(
+        recognizer.update(0.5 + rng.gauss(0, noise), 0.5 + rng.gauss(0, noise), frame / fps) is not None
+        for frame in range(seconds * fps)
+    )
+
+
+@pytest.mark.parametrize('fps', [15, 30, 60])
+@pytest.mark.parametrize('dx, dy, expected', [(1, 0, 'RIGHT'), (0, -1, 'UP'), (-1, 0, 'LEFT'), (0, 1, 'DOWN')])
+def test_swipe_commits_within_two_frames(fps, dx, dy, expected):
+    for seed in range(4):
+        fired = swipe(fps, dx, dy, seed=seed)
+        assert len(fired) == 1
+        frames, direction = fired[0]
+        assert direction == expected
+        assert 1 <= frames <= 2
+
+
+@pytest.mark.parametrize('fps', [15, 30, 60])
+def test_slower_swipe_commits_within_three_frames(fps):
+    fired = swipe(fps, 1, 0, speed=1.3)
+    assert [direction for _, direction in fired] == ['RIGHT']
+    assert 1 <= fired[0][0] <= 3
+
+
+@pytest.mark.parametrize('fps', [15, 30, 60])
+def test_still_hand_never_swipes(fps):
+    assert still_hand(fps, noise=0.01) == 0
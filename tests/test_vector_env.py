@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from engine import Game
+from vector_env import ACTIONS, NO_ACTION, VectorGame
+
+
+def sync_food(game, batch, row):
+    """Put the batch's food for ``row`` into ``game``, whose own draws differ"""
+    y, x = divmod(int(batch.food[row]), batch.grid_width)
+    game.food_pos = (x, y)
+
+
+@pytest.mark.parametrize('grid_width, grid_height, num_games', [(2, 2, 64), (3, 3, 64), (6, 5, 32)])
+def test_batch_matches_engine_step_for_step(grid_width, grid_height, num_games):
+    batch = VectorGame(num_games, grid_width, grid_height, seed=7)
+    games = [Game(grid_width, grid_height) for _ in range(num_games)]
+    for row, game in enumerate(games):
+        sync_food(game, batch, row)
+    rng = np.random.default_rng(11)
+    finished = won = 0
+
+    for _ in range(1500):
+        # Random turns, reversals and "keep going" alike
+        actions = rng.integers(NO_ACTION, len(ACTIONS), num_games)
+        result = batch.step(actions)
+        for row, game in enumerate(games):
+            action = actions[row]
+            step = game.step(None if action == NO_ACTION else ACTIONS[action])
+            assert result.ate[row] == step.ate
+            assert result.done[row] == (not step.alive)
+            if not step.alive:
+                assert result.won[row] == game.won
+                assert result.final_score[row] == game.score
+                assert result.final_length[row] == len(game.snake)
+                finished += 1
+                won += game.won
+                game.reset()
+            else:
+                assert batch.heads[row] == game.snake.head[1] * grid_width + game.snake.head[0]
+                assert batch.length[row] == len(game.snake)
+                assert batch.score[row] == game.score
+                assert batch.move_delay[row] == game.move_delay
+                assert bytes(batch.occupied[row]) == bytes(game.snake.occupied)
+            sync_food(game, batch, row)
+
+    assert finished > 0
+    if grid_width * grid_height <= 4:
+        assert won > 0  # random play fills the smallest boards now and then
@@ -0,0 +1,160 @@
+"""Many snake games stepped at once with NumPy.
+
+``VectorGame`` holds ``num_games`` boards as arrays and advances all of them
+with one vectorized ``step(actions)``, for training and evaluating movement
+policies at millions of env-steps per second.  The rules are those of
+``engine.Game``: the board wraps around, the snake dies running into
+itself (the tail cell is free unless it is growing), food makes it grow on
+the next move and scores ``FOOD_SCORE``, and filling the board wins.
+Finished games are reset in the same call.
+
+State, one row per game, cells indexed ``y * grid_width + x`` as in the
+engine:
+
+    occupied   (N, cells) uint8, 1 where the snake is
+    body       (N, cells) int32 ring buffer of body cells; the head is at
+               ``body[i, head_slot[i]]`` and the tail ``length - 1`` slots behind
+    food       (N,) cell of the food
+    direction  (N,) index into ACTIONS
+
+Actions are indices into ``ACTIONS`` (UP, DOWN, LEFT, RIGHT), or -1 to keep
+going straight; reversing is ignored as in ``Snake.set_direction``.  Food
+comes from the batch's own NumPy generator, so a seeded batch is
+reproducible but does not place food where ``Game`` with the same seed would.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from engine import (DOWN, FOOD_SCORE, INITIAL_MOVE_DELAY, LEFT, MIN_MOVE_DELAY, RIGHT,
+                    SPEEDUP_PER_FOOD, UP)
+
+ACTIONS = (UP, DOWN, LEFT, RIGHT)
+NO_ACTION = -1
+OPPOSITE = np.array([1, 0, 3, 2])
+FOOD_TRIES = 4  # random draws per game before falling back to an exact pick among free cells
+
+# Arrays over the games of one step; the final_* values are those of games
+# that ended this step, read before they were reset (0 for the others)
+VectorStep = namedtuple('VectorStep', ['ate', 'done', 'won', 'final_score', 'final_length'])
+
+
+class VectorGame:
+    def __init__(self, num_games, grid_width, grid_height, seed=None):
+        self.num_games = num_games
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cells = cells = grid_width * grid_height
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(num_games)
+
+        # neighbors[cell, action] is the cell one move away, wrapping
+        y, x = np.divmod(np.arange(cells), grid_width)
+        self.neighbors = np.stack([
+            (x + dx) % grid_width + ((y + dy) % grid_height) * grid_width for dx, dy in ACTIONS
+        ], axis=1).astype(np.int32)
+        self.start_cell = (grid_height // 2) * grid_width + grid_width // 2
+
+        self.occupied = np.zeros((num_games, cells), dtype=np.uint8)
+        self.body = np.zeros((num_games, cells), dtype=np.int32)
+        self.head_slot = np.zeros(num_games, dtype=np.int32)
+        self.length = np.zeros(num_games, dtype=np.int32)
+        self.direction = np.zeros(num_games, dtype=np.int32)
+        self.grow = np.zeros(num_games, dtype=bool)
+        self.food = np.zeros(num_games, dtype=np.int32)
+        self.score = np.zeros(num_games, dtype=np.int32)
+        self.ticks = np.zeros(num_games, dtype=np.int32)
+        self.move_delay = np.zeros(num_games, dtype=np.int32)
+        self.reset()
+
+    @property
+    def heads(self):
+        return self.body[self.rows, self.head_slot]
+
+    def reset(self, games=None):
+        """Start new games in the rows ``games`` (an index array or mask), or in all of them"""
+        rows = self.rows if games is None else self.rows[games]
+        if len(rows) == 0:
+            return
+        self.occupied[rows] = 0
+        self.occupied[rows, self.start_cell] = 1
+        self.head_slot[rows] = 0
+        self.body[rows, 0] = self.start_cell
+        self.length[rows] = 1
+        self.direction[rows] = ACTIONS.index(RIGHT)
+        self.grow[rows] = False
+        self.score[rows] = 0
+        self.ticks[rows] = 0
+        self.move_delay[rows] = INITIAL_MOVE_DELAY
+        self._spawn_food(rows)
+
+    def step(self, actions=None):
+        """Advance every game one tick; returns a VectorStep"""
+        rows = self.rows
+        cells = self.cells
+        if actions is not None:
+            actions = np.asarray(actions)
+            turn = (actions != NO_ACTION) & (actions != OPPOSITE[self.direction])
+            self.direction = np.where(turn, actions, self.direction)
+
+        head = self.body[rows, self.head_slot]
+        new_head = self.neighbors[head, self.direction]
+        tail_slot = self.head_slot - self.length + 1
+        tail_slot %= cells
+        tail = self.body[rows, tail_slot]
+
+        # The tail cell is free to enter unless the snake is growing, since the tail leaves it
+        hit = self.occupied[rows, new_head].astype(bool) & (self.grow | (new_head != tail))
+        moving = ~hit
+
+        # Tails leave, except on the move after eating
+        leaving = moving & ~self.grow
+        self.occupied[rows[leaving], tail[leaving]] = 0
+        self.length += moving & self.grow
+        self.grow[moving] = False
+
+        moved = rows[moving]
+        self.head_slot[moved] = (self.head_slot[moved] + 1) % cells
+        self.body[moved, self.head_slot[moved]] = new_head[moved]
+        self.occupied[moved, new_head[moved]] = 1
+        self.ticks += 1
+
+        ate = moving & (new_head == self.food)
+        self.grow |= ate
+        self.score += ate * FOOD_SCORE
+        self.move_delay = np.where(ate, np.maximum(MIN_MOVE_DELAY, self.move_delay - SPEEDUP_PER_FOOD),
+                                   self.move_delay)
+        # A snake that eats when it covers every cell but the food has won
+        won = ate & (self.length == cells)
+        if ate.any():
+            self._spawn_food(rows[ate & ~won])
+
+        done = hit | won
+        final_score = np.where(done, self.score, 0)
+        final_length = np.where(done, self.length, 0)
+        if done.any():
+            self.reset(done)
+        return VectorStep(ate, done, won, final_score, final_length)
+
+    def _spawn_food(self, rows):
+        """Place food uniformly on a free cell of each game in ``rows``"""
+        # Random cells until they land on a free one; cheap while boards are mostly empty
+        for _ in range(FOOD_TRIES):
+            if len(rows) == 0:
+                return
+            picks = self.rng.integers(0, self.cells, len(rows))
+            free = self.occupied[rows, picks] == 0
+            self.food[rows[free]] = picks[free]
+            rows = rows[~free]
+        if len(rows):
+            # Crowded boards: the free cell with the highest random key
+            keys = self.rng.random((len(rows), self.cells))
+            keys[self.occupied[rows].astype(bool)] = -1
+            self.food[rows] = keys.argmax(axis=1)
+
+    def grid(self):
+        """Boards as an (N, grid_height, grid_width) int8 array: 0 empty, 1 body, 2 head, 3 food"""
+        grid = self.occupied.astype(np.int8)
+        grid[self.rows, self.heads] = 2
+        grid[self.rows, self.food] = 3
+        return grid.reshape(self.num_games, self.grid_height, self.grid_width)